@@ -20,7 +20,7 @@ from app.schemas.project import (
     PaginatedProjectsResponse
 )
 from app.schemas.document import DocumentResponse
-from app.services.storage_service import StorageService
+from app.services.storage_service import get_storage_service
 from app.services.document_processor import DocumentProcessor
 
 router = APIRouter(prefix="/projects", tags=["projects"])
@@ -248,10 +248,10 @@ async def delete_project(
         raise HTTPException(status_code=404, detail="Project not found")
 
     # Delete from storage
-    storage_service = StorageService()
+    storage_service = get_storage_service()
     for document in db_project.documents:
         try:
-            storage_service.delete_file(document.file_path)
+            await storage_service.adelete_file(document.file_path)
         except Exception as e:
             # Log but don't fail delete
             print(f"Warning: Could not delete file {document.file_path}: {e}")
@@ -302,7 +302,7 @@ async def upload_documents(
             raise HTTPException(status_code=400, detail="Only one main document allowed")
 
     # Process uploads
-    storage_service = StorageService()
+    storage_service = get_storage_service()
     processor = DocumentProcessor()
     uploaded_docs = []
 
@@ -313,7 +313,7 @@ async def upload_documents(
 
         # Upload to storage
         try:
-            file_path = storage_service.upload_file(
+            file_path = await storage_service.aupload_file(
                 file.file,
                 file.filename,
                 project_id,
@@ -327,7 +327,7 @@ async def upload_documents(
             metadata = await processor.extract_metadata(file_path)
         except Exception as e:
             # Clean up uploaded file
-            storage_service.delete_file(file_path)
+            await storage_service.adelete_file(file_path)
             raise HTTPException(status_code=500, detail=f"PDF processing failed: {str(e)}")
 
         # Create document record
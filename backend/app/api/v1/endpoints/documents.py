@@ -7,28 +7,41 @@ import json
 from typing import List
 from uuid import UUID, uuid4
 from pathlib import Path
+import asyncpg
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from loguru import logger
 
-from app.db.session import get_db
+from app.db.session import get_db, get_raw_conn
 from app.db.models import Document, Project, DocumentType
 from app.schemas.document import (
     DocumentResponse,
     DocumentUpdate,
     DocumentUploadResponse,
+    DocumentUploadUrlRequest,
+    DocumentUploadUrlResponse,
+    DocumentUploadComplete,
     SectionSuggestionResponse,
     SectionSchema,
 )
 from app.core.config import settings
+from app.helpers.project_ref import project_ref
+from app.helpers.upload_token import create_upload_token, verify_upload_token
 from app.tasks.document_tasks import index_document_task, index_project_documents_task
-from app.services.storage_service import storage_service
+from app.services.storage_service import get_storage_service
 from app.services.document_processor import DocumentProcessor
 from langchain_openai import ChatOpenAI
 
 router = APIRouter()
 
+# Presigned POSTs live for an hour; the completion call may follow a slow upload
+_UPLOAD_URL_TTL = 3600
+_UPLOAD_TOKEN_TTL = 2 * _UPLOAD_URL_TTL
+
+# Storage filenames issued by /upload-url: "<uuid4>_<original basename>"
+_ISSUED_FILENAME_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}_[^/\\]+$")
+
 
 @router.post("/upload", response_model=DocumentUploadResponse)
 async def upload_document(
@@ -79,7 +92,7 @@ async def upload_document(
             file.file.seek(0)
 
             # Upload to Supabase Storage
-            storage_path = storage_service.upload_file(
+            storage_path = await get_storage_service().aupload_file(
                 file=file.file,
                 filename=unique_filename,
                 project_id=project_id,
@@ -118,7 +131,7 @@ async def upload_document(
         logger.info(f"Uploaded document {document.id}: {file.filename}")
 
         # Kick off async indexing in Celery to keep request light
-        task = index_document_task.delay(str(document.id), str(project_id))
+        task = index_document_task.delay(str(document.id), project_ref(project_id).s)
 
         return DocumentUploadResponse(
             document_id=document.id,
@@ -140,6 +153,172 @@ async def upload_document(
         )
 
 
+@router.post("/upload-url", response_model=DocumentUploadUrlResponse)
+async def create_upload_url(
+    request: DocumentUploadUrlRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Create a presigned POST so the client uploads directly to storage."""
+    if not settings.USE_SUPABASE_STORAGE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Direct uploads require object storage"
+        )
+
+    try:
+        result = await db.execute(
+            select(Project.id).where(Project.id == request.project_id)
+        )
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
+
+        # Client names never contribute path segments to the storage key
+        original_filename = Path(request.filename).name
+        file_ext = Path(original_filename).suffix.lower().replace('.', '')
+        if file_ext not in settings.allowed_extensions_list:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid file type. Allowed: {settings.ALLOWED_EXTENSIONS}"
+            )
+
+        unique_filename = f"{uuid4()}_{original_filename}"
+        presigned = await get_storage_service().agenerate_upload_url(
+            filename=unique_filename,
+            project_id=request.project_id,
+            content_type=request.content_type,
+            expires_in=_UPLOAD_URL_TTL
+        )
+
+        # /upload-complete only accepts the key, names and type issued here
+        upload_token = create_upload_token(
+            {
+                "project_id": project_ref(request.project_id).s,
+                "filename": unique_filename,
+                "original_filename": original_filename,
+                "document_type": request.document_type.value,
+            },
+            expires_in=_UPLOAD_TOKEN_TTL
+        )
+
+        return DocumentUploadUrlResponse(
+            url=presigned["url"],
+            fields=presigned["fields"],
+            filename=unique_filename,
+            storage_path=presigned["storage_path"],
+            upload_token=upload_token
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating upload URL: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating upload URL: {str(e)}"
+        )
+
+
+@router.post("/upload-complete", response_model=DocumentUploadResponse)
+async def complete_upload(
+    upload: DocumentUploadComplete,
+    db: AsyncSession = Depends(get_db)
+):
+    """Record a document uploaded via /upload-url and start indexing."""
+    if not settings.USE_SUPABASE_STORAGE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Direct uploads require object storage"
+        )
+
+    claims = verify_upload_token(upload.upload_token)
+    if claims is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or expired upload token"
+        )
+
+    try:
+        ref = project_ref(claims["project_id"])
+        filename = claims["filename"]
+        original_filename = claims["original_filename"]
+        document_type = DocumentType(claims["document_type"])
+
+        # Defence in depth: the signed key must still look like one /upload-url issues
+        file_ext = Path(filename).suffix.lower().replace('.', '')
+        if not _ISSUED_FILENAME_RE.match(filename) or file_ext not in settings.allowed_extensions_list:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid upload token"
+            )
+
+        result = await db.execute(
+            select(Project.id).where(Project.id == ref.id)
+        )
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
+
+        storage_path = f"{ref.prefix}{filename}"
+        result = await db.execute(
+            select(Document.id).where(Document.file_path == storage_path)
+        )
+        if result.scalar_one_or_none() is not None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Upload already registered"
+            )
+
+        try:
+            info = await get_storage_service().aget_file_info(storage_path)
+        except Exception:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Uploaded file not found in storage"
+            )
+
+        document = Document(
+            project_id=ref.id,
+            filename=filename,
+            original_filename=original_filename,
+            file_path=storage_path,
+            file_size=info["size"],
+            mime_type=info["content_type"],
+            document_type=document_type
+        )
+
+        db.add(document)
+        await db.commit()
+        await db.refresh(document)
+
+        logger.info(f"Registered direct upload {document.id}: {original_filename}")
+
+        task = index_document_task.delay(str(document.id), ref.s)
+
+        return DocumentUploadResponse(
+            document_id=document.id,
+            filename=original_filename,
+            file_size=info["size"],
+            document_type=document_type,
+            task_id=task.id,
+            message="Document uploaded and indexing started."
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Error completing upload: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error completing upload: {str(e)}"
+        )
+
+
 @router.post("/{document_id}/index", status_code=status.HTTP_202_ACCEPTED)
 async def index_document(
     document_id: UUID,
@@ -207,13 +386,14 @@ async def index_project_documents(
             )
 
         # Trigger Celery task
-        task = index_project_documents_task.delay(str(project_id))
+        ref = project_ref(project_id)
+        task = index_project_documents_task.delay(ref.s)
 
         logger.info(f"Started project indexing task for {project_id}: {task.id}")
 
         return {
             "message": "Project indexing started",
-            "project_id": str(project_id),
+            "project_id": ref.s,
             "task_id": task.id
         }
 
@@ -253,14 +433,21 @@ async def list_project_documents(
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    conn: asyncpg.Connection = Depends(get_raw_conn)
 ):
-    """Get document details."""
+    """Get document details (polled while indexing, so served from the raw pool)."""
     try:
-        result = await db.execute(
-            select(Document).where(Document.id == document_id)
+        document = await conn.fetchrow(
+            """
+            SELECT id, project_id, filename, original_filename, file_path, file_size,
+                   mime_type, document_type::text AS document_type, page_count,
+                   COALESCE(indexed, false) AS indexed, indexed_at,
+                   metadata AS metadata_, created_at
+            FROM documents
+            WHERE id = $1
+            """,
+            document_id,
         )
-        document = result.scalar_one_or_none()
 
         if not document:
             raise HTTPException(
@@ -268,7 +455,7 @@ async def get_document(
                 detail="Document not found"
             )
 
-        return document
+        return dict(document)
 
     except HTTPException:
         raise
@@ -475,7 +662,7 @@ async def delete_document(
 
         # Delete file from storage
         if settings.USE_SUPABASE_STORAGE:
-            storage_service.delete_file(document.file_path)
+            await get_storage_service().adelete_file(document.file_path)
         else:
             if os.path.exists(document.file_path):
                 os.remove(document.file_path)
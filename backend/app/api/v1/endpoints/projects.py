@@ -30,7 +30,7 @@ async def create_project(
         await db.refresh(project)
 
         # Create Weaviate schema for project
-        vector_store.create_schema(project.id)
+        await vector_store.acreate_schema(project.id)
 
         logger.info(f"Created project {project.id}")
         return project
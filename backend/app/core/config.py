@@ -36,7 +36,9 @@ class Settings(BaseSettings):
     DB_POOL_SIZE: int = 20
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_TIMEOUT: int = 30
-    DB_POOL_RECYCLE: int = 3600
+    DB_POOL_RECYCLE: int = 60  # Short recycle replaces stale PgBouncer connections cheaply
+    DB_POOL_PRE_PING: bool = False  # Pre-ping leaves PgBouncer backends "idle in transaction"
+    DB_RAW_POOL_SIZE: int = 5  # Raw asyncpg pool for status polls, on top of the engine pool
 
     # Security
     SECRET_KEY: str = "change-this-in-production"
@@ -63,11 +65,16 @@ class Settings(BaseSettings):
     S3_SECRET_ACCESS_KEY: str = ""
     S3_REGION: str = "ap-south-1"
     S3_BUCKET: str = "ipo-documents"
+    S3_ENSURE_BUCKET: bool = False  # HEAD/create the bucket once at API startup
 
     # Weaviate
     WEAVIATE_URL: str = "http://localhost:8080"
     WEAVIATE_API_KEY: str = ""
     WEAVIATE_BATCH_SIZE: int = 100
+    # Vector compression for new collections: none, pq or bq. PQ only compresses after
+    # a training set of vectors is indexed and needs async indexing enabled in Weaviate
+    WEAVIATE_QUANTIZER: str = "none"
+    WEAVIATE_PQ_SEGMENTS: int = 0  # Must divide OPENAI_EMBEDDING_DIMENSION; 0 derives it
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -86,6 +93,8 @@ class Settings(BaseSettings):
     OPENAI_EMBEDDING_MODEL: str = "text-embedding-3-large"
     OPENAI_EMBEDDING_DIMENSION: int = 3072
     OPENAI_EMBEDDING_BATCH_SIZE: int = 100  # Number of texts to embed per API request
+    OPENAI_EMBEDDING_CONCURRENCY: int = 4  # Concurrent embedding requests while indexing
+    EMBED_CACHE_SIZE: int = 4096  # Per-process cached embeddings (~12KB each at 3072 dims)
     OPENAI_CHAT_MODEL: str = "gpt-4.1"  # GPT-4.1 (2025) - 1M token context, superior coding/reasoning
     OPENAI_TEMPERATURE: float = 0.1
     OPENAI_MAX_TOKENS: int = 4096
@@ -94,12 +103,16 @@ class Settings(BaseSettings):
     GEMINI_MODEL: str = "gemini-2.5-pro"  # Gemini 2.5 Pro (2025) - Google's most intelligent model
     GEMINI_TEMPERATURE: float = 0.1
     GEMINI_MAX_TOKENS: int = 4096
+    GEMINI_CONCURRENCY: int = 8  # Max in-flight verification calls in verify_batch
 
     # Mistral Configuration (Document AI & OCR)
     MISTRAL_MODEL: str = "mistral-large-latest"  # For chat and verification
     MISTRAL_OCR_ENDPOINT: str = "https://api.mistral.ai/v1/ocr"
     MISTRAL_TEMPERATURE: float = 0.1
     MISTRAL_MAX_TOKENS: int = 4096
+    MISTRAL_CONCURRENCY: int = 8  # Max in-flight page requests for batch extraction
+    MISTRAL_CACHE_ENABLED: bool = True  # Memoize OCR/extraction responses in Redis
+    MISTRAL_CACHE_TTL: int = 2592000  # 30 days
 
     # LangChain Settings
     LANGCHAIN_TRACING_V2: bool = False
@@ -116,6 +129,7 @@ class Settings(BaseSettings):
     VERIFICATION_BATCH_SIZE: int = 5
     VERIFICATION_CONCURRENCY: int = 4
     VERIFICATION_COMMIT_INTERVAL: int = 5  # Commit every N verified sentences
+    PROGRESS_PUBLISH_INTERVAL: float = 0.5  # Min seconds between progress events per job
     # Retrieval/Chunking
     CHUNK_SIZE: int = 1200            # default for clean text
     CHUNK_OVERLAP: int = 180
@@ -125,6 +139,14 @@ class Settings(BaseSettings):
     HYBRID_ALPHA: float = 0.65        # balance between semantic and keyword in hybrid search
     RERANK_CANDIDATES: int = 60
     RERANK_TOP_K: int = 20            # send only top-N to LLM
+    MAX_EVIDENCE_CHARS: int = 4000    # per-chunk cap on evidence text sent to the LLM
+    LOCAL_RERANKER_ENABLED: bool = False  # Cross-encoder rerank when Cohere isn't configured (needs sentence-transformers)
+    LOCAL_RERANKER_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    RERANK_BATCH_SIZE: int = 32
+    SEMANTIC_CACHE_ENABLED: bool = False  # Reuse verdicts for repeated/paraphrased claims with identical evidence
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95
+    SEMANTIC_CACHE_TTL: int = 86400
+    SEMANTIC_CACHE_SIZE: int = 10000
 
     # File Upload
     MAX_UPLOAD_SIZE: int = 104857600  # 100MB
@@ -143,3 +165,4 @@ class Settings(BaseSettings):
 
 
 settings = Settings()
+
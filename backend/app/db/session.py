@@ -1,26 +1,56 @@
 """Database session management with connection pooling."""
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool
 from loguru import logger
-from uuid import uuid4
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Tuple
+import asyncio
+import asyncpg
+import itertools
+import orjson
+import os
 
 from app.core.config import settings
 
 # Convert PostgreSQL URL to async version
 DATABASE_URL = settings.DATABASE_URL.replace('postgresql://', 'postgresql+asyncpg://')
 
+_stmt_counter = itertools.count()
+
+
+def prepared_statement_name() -> str:
+    """Unique prepared statement name; the pid keeps forked workers collision-free."""
+    return f"__asyncpg_{next(_stmt_counter)}_{os.getpid()}__"
+
+
+def _json_dumps(value) -> str:
+    """Serialize JSON/JSONB values with orjson instead of the stdlib encoder."""
+    return orjson.dumps(value).decode()
+
+
 # Create async engine with pgbouncer compatibility
 engine = create_async_engine(
     DATABASE_URL,
     echo=settings.DEBUG,
-    pool_pre_ping=True,
+    # PgBouncer: pre-ping's SELECT 1 opens a transaction that is never committed,
+    # so rely on a short recycle interval to replace stale connections instead
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
     connect_args={
         # Disable prepared statements so pgbouncer (transaction/statement mode) won't choke
         "statement_cache_size": 0,
         "prepared_statement_cache_size": 0,
         # Generate unique names if the driver prepares anyway
-        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        "prepared_statement_name_func": prepared_statement_name,
+        # Short OLTP queries never benefit from JIT planning
+        "server_settings": {"jit": "off"},
     },
 )
 
@@ -33,8 +63,148 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Raw asyncpg pool for hot read-only lookups (status polls) that don't need the ORM
+raw_pool: Optional[asyncpg.Pool] = None
+# Serializes pool creation so concurrent first requests don't each build one
+_raw_pool_lock = asyncio.Lock()
+
+
+async def _init_raw_connection(conn: asyncpg.Connection) -> None:
+    """Decode JSON/JSONB columns to Python objects like the ORM does."""
+    for typename in ("json", "jsonb"):
+        await conn.set_type_codec(
+            typename, encoder=_json_dumps, decoder=orjson.loads, schema="pg_catalog"
+        )
+
+
+async def init_raw_pool():
+    """Create the raw asyncpg pool used by read-only status endpoints (idempotent)."""
+    global raw_pool
+    async with _raw_pool_lock:
+        if raw_pool is not None:
+            return
+        raw_pool = await asyncpg.create_pool(
+            dsn=DATABASE_URL.replace('postgresql+asyncpg://', 'postgresql://'),
+            # Sized on its own; it counts against PgBouncer on top of the engine pool
+            min_size=min(2, settings.DB_RAW_POOL_SIZE),
+            max_size=settings.DB_RAW_POOL_SIZE,
+            # Same pgbouncer constraints as the engine above
+            statement_cache_size=0,
+            server_settings={"jit": "off"},
+            init=_init_raw_connection,
+        )
+    logger.info("Raw asyncpg pool created")
+
+
+async def close_raw_pool():
+    """Close the raw asyncpg pool."""
+    global raw_pool
+    if raw_pool is not None:
+        await raw_pool.close()
+        raw_pool = None
+        logger.info("Raw asyncpg pool closed")
+
+
+async def get_raw_conn() -> AsyncIterator[asyncpg.Connection]:
+    """
+    Dependency for getting a raw asyncpg connection.
+
+    Yields:
+        asyncpg.Connection: Connection acquired from the raw pool
+    """
+    if raw_pool is None:
+        await init_raw_pool()
+    async with raw_pool.acquire() as conn:
+        yield conn
+
+
+# Celery task engines, one per worker process (see get_task_session)
+_task_engines: Dict[int, Tuple[AsyncEngine, async_sessionmaker]] = {}
+
+
+def _get_task_engine() -> Tuple[AsyncEngine, async_sessionmaker]:
+    """Return this process's task engine and session factory, creating them on first use."""
+    pid = os.getpid()
+    cached = _task_engines.get(pid)
+    if cached is None:
+        task_engine = create_async_engine(
+            DATABASE_URL,
+            echo=settings.DEBUG,
+            # NullPool keeps no connections between checkouts, so the engine holds
+            # nothing bound to an event loop; PgBouncer does the pooling
+            poolclass=NullPool,
+            connect_args={
+                # Disable prepared statements for pgbouncer compatibility
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                # Generate unique prepared statement names to avoid collisions in pgbouncer
+                "prepared_statement_name_func": prepared_statement_name,
+                "server_settings": {"jit": "off"},
+            },
+            # Also disable SQLAlchemy-side prepared statement caching
+            execution_options={"prepared_statement_cache_size": 0},
+            # Rows per multi-row INSERT for executemany bulk inserts (sentences,
+            # citations, chunks); ~11 columns keeps each page under asyncpg's bind limit
+            insertmanyvalues_page_size=1000,
+            # JSONB values (chunk metadata) are encoded once per row during bulk inserts
+            json_serializer=_json_dumps,
+            json_deserializer=orjson.loads,
+        )
+        session_factory = async_sessionmaker(
+            task_engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autocommit=False,
+            autoflush=False,
+        )
+        cached = _task_engines[pid] = (task_engine, session_factory)
+    return cached
+
+
+@asynccontextmanager
+async def get_task_session() -> AsyncIterator[AsyncSession]:
+    """
+    Async database session for Celery tasks.
+
+    The global engine above is created in the parent process and its pooled
+    connections are bound to that process's event loop, so prefork workers
+    running tasks on their own event loop can't use it. Tasks instead share one
+    NullPool engine per worker process (keyed by pid, so forked children
+    never inherit the parent's), which skips rebuilding the engine and its
+    dialect initialization on every task. PgBouncer does the pooling.
+
+    The session is bound to a single connection held for the whole block.
+    With NullPool every checkout is a fresh connection that repeats asyncpg's
+    codec registration and enum type introspection, so without this each
+    commit in a long task (e.g. verification checkpoints) would pay that
+    setup again on its next statement.
+
+    Yields:
+        AsyncSession: Database session
+    """
+    task_engine, session_factory = _get_task_engine()
+    async with task_engine.connect() as conn:
+        async with session_factory(bind=conn) as session:
+            try:
+                yield session
+            except Exception:
+                await session.rollback()
+                raise
+            finally:
+                await session.close()
+
+
+async def dispose_task_engines():
+    """Dispose the task engines created by this process."""
+    cached = _task_engines.pop(os.getpid(), None)
+    if cached is not None:
+        await cached[0].dispose()
+        logger.info("Task database engine disposed")
+
+
 # Base class for models
-Base = declarative_base()
+class Base(DeclarativeBase):
+    pass
 
 
 async def get_db() -> AsyncSession:
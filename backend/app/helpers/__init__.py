@@ -14,6 +14,7 @@ from .rse import (
     adjust_relevance_values_for_chunk_length,
     RSE_PARAMS_PRESETS,
 )
+from .project_ref import ProjectRef, project_ref
 
 __all__ = [
     "get_best_segments",
@@ -22,4 +23,6 @@ __all__ = [
     "get_relevance_values",
     "adjust_relevance_values_for_chunk_length",
     "RSE_PARAMS_PRESETS",
+    "ProjectRef",
+    "project_ref",
 ]
@@ -0,0 +1,44 @@
+"""Per-project identifiers derived from the project UUID."""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Union
+from uuid import UUID
+
+
+@dataclass(frozen=True, slots=True)
+class ProjectRef:
+    """
+    Project UUID with its string forms precomputed.
+
+    Attributes:
+        id: Project UUID
+        s: Hyphenated string form
+        prefix: Object storage key prefix for the project's files
+        collection: Weaviate collection name
+    """
+    id: UUID
+    s: str
+    prefix: str
+    collection: str
+
+
+@lru_cache(maxsize=1024)
+def project_ref(project_id: Union[UUID, str]) -> ProjectRef:
+    """
+    Return the (memoized) ProjectRef for a project.
+
+    Args:
+        project_id: Project UUID or its string form
+
+    Returns:
+        ProjectRef with precomputed string forms
+    """
+    uid = project_id if isinstance(project_id, UUID) else UUID(str(project_id))
+    s = str(uid)
+    return ProjectRef(
+        id=uid,
+        s=s,
+        prefix=f"projects/{s}/",
+        collection=f"Project_{s.replace('-', '_')}",
+    )
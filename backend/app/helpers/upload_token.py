@@ -0,0 +1,67 @@
+"""Signed tokens tying a direct-upload completion to the storage key issued for it."""
+
+from typing import Any, Dict, Optional
+import base64
+import hashlib
+import hmac
+import time
+
+import orjson
+
+from app.core.config import settings
+
+# Domain-separates these signatures from any other use of SECRET_KEY
+_CONTEXT = b"upload-token:"
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(settings.SECRET_KEY.encode("utf-8"), _CONTEXT + payload, hashlib.sha256).digest()
+
+
+def create_upload_token(claims: Dict[str, Any], expires_in: int) -> str:
+    """
+    Sign upload claims into an opaque token.
+
+    Args:
+        claims: JSON-serializable claims (project, storage key, filenames, type)
+        expires_in: Token lifetime in seconds
+
+    Returns:
+        Token string "<payload>.<signature>"
+    """
+    payload = orjson.dumps({**claims, "exp": int(time.time()) + expires_in})
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def verify_upload_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Verify a token from create_upload_token.
+
+    Args:
+        token: Token string
+
+    Returns:
+        The signed claims, or None if the token is malformed, forged or expired
+    """
+    try:
+        payload_part, signature_part = token.split(".", 1)
+        payload = _b64decode(payload_part)
+        signature = _b64decode(signature_part)
+    except ValueError:
+        return None
+
+    if not hmac.compare_digest(signature, _sign(payload)):
+        return None
+
+    claims = orjson.loads(payload)
+    if claims.get("exp", 0) < time.time():
+        return None
+    return claims
@@ -9,7 +9,8 @@ import socketio
 
 from app.core.config import settings
 from app.core.logging import setup_logging
-from app.db.session import engine, init_db
+from app.db.session import engine, init_db, init_raw_pool, close_raw_pool
+from app.services.storage_service import get_storage_service
 from app.api.v1.router import api_router
 
 # Setup logging
@@ -31,11 +32,16 @@ async def lifespan(app: FastAPI):
     logger.info("Starting up IPO Verification API...")
     await init_db()
     logger.info("Database initialized")
+    await init_raw_pool()
+    if settings.USE_SUPABASE_STORAGE and settings.S3_ENSURE_BUCKET:
+        # Once per app instead of on every module import / worker start
+        get_storage_service().ensure_bucket_exists()
 
     yield
 
     # Shutdown
     logger.info("Shutting down...")
+    await close_raw_pool()
     await engine.dispose()
     logger.info("Database connections closed")
 
@@ -6,7 +6,8 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime
 from pydantic import BaseModel, Field
 from uuid import UUID
-from typing import List
+
+from app.db.models import DocumentType
 
 
 class DocumentResponse(BaseModel):
@@ -22,7 +23,7 @@ class DocumentResponse(BaseModel):
     page_count: Optional[int] = None
     indexed: bool
     indexed_at: Optional[datetime] = None
-    metadata: Dict[str, Any] = Field(default={}, alias="metadata_")
+    metadata: Dict[str, Any] = Field(default_factory=dict, alias="metadata_")
     created_at: datetime
 
     class Config:
@@ -40,6 +41,28 @@ class DocumentUploadResponse(BaseModel):
     message: str
 
 
+class DocumentUploadUrlRequest(BaseModel):
+    """Request a presigned URL for a direct-to-storage upload."""
+    project_id: UUID
+    filename: str
+    content_type: str = "application/octet-stream"
+    document_type: DocumentType
+
+
+class DocumentUploadUrlResponse(BaseModel):
+    """Presigned POST target; the client sends `fields` plus the file to `url`."""
+    url: str
+    fields: Dict[str, str]
+    filename: str
+    storage_path: str
+    upload_token: str
+
+
+class DocumentUploadComplete(BaseModel):
+    """Register a document after its direct upload finished."""
+    upload_token: str
+
+
 class DocumentUpdate(BaseModel):
     """Updatable fields for a document."""
     filename: Optional[str] = None
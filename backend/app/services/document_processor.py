@@ -8,9 +8,10 @@ Uses LangChain's RecursiveCharacterTextSplitter for optimal chunking with:
 - Page number tracking for citations
 """
 
+import asyncio
 import os
 import re
-from typing import List, Dict, Tuple, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 from loguru import logger
 
@@ -33,6 +34,9 @@ except LookupError:
 
 # punkt_tab is optional for new NLTK; absence is non-fatal.
 
+# Regex sentence split used when punkt is unavailable
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
 
 class DocumentProcessor:
     """Service for processing documents (PDF, DOCX) and extracting text."""
@@ -85,8 +89,8 @@ class DocumentProcessor:
         # Import Mistral service only if needed
         if self.use_mistral_ocr:
             try:
-                from app.services.mistral_service import mistral_service
-                self.mistral_service = mistral_service
+                from app.services.mistral_service import get_mistral_service
+                self.mistral_service = get_mistral_service()
                 logger.info("Mistral OCR enabled for document processing")
             except Exception as e:
                 logger.warning(f"Failed to load Mistral service: {e}. Falling back to pdfplumber.")
@@ -95,6 +99,42 @@ class DocumentProcessor:
         else:
             self.mistral_service = None
 
+    @staticmethod
+    def _read_pdf_pages(file_path: str) -> Tuple[str, List[Dict], Dict, bool]:
+        """
+        Read page text from a PDF with pdfplumber (blocking).
+
+        Args:
+            file_path: Path to PDF file
+
+        Returns:
+            Tuple of (full text, pages, metadata, whether any page had text)
+        """
+        pages = []
+        full_text = ""
+        text_found = False
+
+        with pdfplumber.open(file_path) as pdf:
+            for page_num, page in enumerate(pdf.pages, 1):
+                text = page.extract_text() or ""
+                if text.strip():
+                    text_found = True
+                pages.append({
+                    "page_number": page_num,
+                    "text": text,
+                    "char_start": len(full_text),
+                    "char_end": len(full_text) + len(text)
+                })
+                full_text += text + "\n"
+
+            metadata = {
+                "page_count": len(pdf.pages),
+                "metadata": pdf.metadata or {},
+                "extraction_method": "pdfplumber"
+            }
+
+        return full_text, pages, metadata, text_found
+
     async def extract_text_from_pdf(self, file_path: str) -> Dict[str, any]:
         """
         Extract text from PDF file with page information.
@@ -107,30 +147,9 @@ class DocumentProcessor:
             Dict containing full text, pages, and metadata
         """
         try:
-            # Primary pass: pdfplumber
+            # Primary pass: pdfplumber (blocking parse runs in a worker thread)
             logger.info(f"Using pdfplumber for PDF extraction: {file_path}")
-            pages = []
-            full_text = ""
-            text_found = False
-
-            with pdfplumber.open(file_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    text = page.extract_text() or ""
-                    if text.strip():
-                        text_found = True
-                    pages.append({
-                        "page_number": page_num,
-                        "text": text,
-                        "char_start": len(full_text),
-                        "char_end": len(full_text) + len(text)
-                    })
-                    full_text += text + "\n"
-
-                metadata = {
-                    "page_count": len(pdf.pages),
-                    "metadata": pdf.metadata or {},
-                    "extraction_method": "pdfplumber"
-                }
+            full_text, pages, metadata, text_found = await asyncio.to_thread(self._read_pdf_pages, file_path)
 
             # If no text (scanned PDF) and OCR enabled, fall back to Mistral
             if (not text_found or len(full_text.strip()) == 0) and self.use_mistral_ocr and self.mistral_service:
@@ -166,7 +185,7 @@ class DocumentProcessor:
             Dict containing full text and metadata
         """
         try:
-            doc = DocxDocument(file_path)
+            doc = await asyncio.to_thread(DocxDocument, file_path)
             paragraphs = []
             full_text = ""
 
@@ -252,42 +271,85 @@ class DocumentProcessor:
         logger.info(f"Created {len(chunk_dicts)} chunks from text")
         return chunk_dicts
 
-    def extract_sentences(self, text: str) -> List[Dict]:
+    def sentence_spans(self, text: str) -> List[Tuple[int, int]]:
         """
-        Extract sentences from text with position information.
+        Locate sentences in text as (start_char, end_char) spans.
 
         Args:
-            text: Text to extract sentences from
+            text: Text to split into sentences
 
         Returns:
-            List of sentence dictionaries with positions
+            List of character spans, one per sentence
         """
-        sentences = []
+        spans = []
         current_pos = 0
 
         # Use NLTK for better sentence tokenization; fallback to regex if resources missing
         if nltk_available:
             sent_list = sent_tokenize(text)
         else:
-            import re
-            sent_list = re.split(r'(?<=[.!?])\s+', text)
+            sent_list = _SENTENCE_SPLIT_RE.split(text)
 
-        for idx, sentence in enumerate(sent_list):
+        for sentence in sent_list:
             # Find the position in the original text
             start_pos = text.find(sentence, current_pos)
             if start_pos == -1:
                 start_pos = current_pos
 
             end_pos = start_pos + len(sentence)
+            spans.append((start_pos, end_pos))
+            current_pos = end_pos
+
+        return spans
+
+    def iter_sentences(
+        self,
+        text: str,
+        spans: List[Tuple[int, int]],
+        pages: Optional[List[Dict]] = None
+    ) -> Iterator[Dict]:
+        """
+        Lazily build sentence dictionaries from precomputed spans.
+
+        Args:
+            text: Source text the spans refer to
+            spans: Sentence spans from sentence_spans()
+            pages: Optional page dictionaries with char positions, ordered by position
 
-            sentences.append({
+        Yields:
+            Sentence dictionaries with positions (and page_number when pages are given)
+        """
+        page_idx = 0
+        for idx, (start_pos, end_pos) in enumerate(spans):
+            sentence = {
                 "index": idx,
-                "content": sentence.strip(),
+                "content": text[start_pos:end_pos].strip(),
                 "start_char": start_pos,
                 "end_char": end_pos
-            })
+            }
 
-            current_pos = end_pos
+            if pages is not None:
+                # Spans are ascending, so the page cursor only moves forward
+                while page_idx < len(pages) and pages[page_idx]["char_end"] <= start_pos:
+                    page_idx += 1
+                if page_idx < len(pages) and pages[page_idx]["char_start"] <= start_pos:
+                    sentence["page_number"] = pages[page_idx]["page_number"]
+                else:
+                    sentence["page_number"] = None
+
+            yield sentence
+
+    def extract_sentences(self, text: str) -> List[Dict]:
+        """
+        Extract sentences from text with position information.
+
+        Args:
+            text: Text to extract sentences from
+
+        Returns:
+            List of sentence dictionaries with positions
+        """
+        sentences = list(self.iter_sentences(text, self.sentence_spans(text)))
 
         logger.info(f"Extracted {len(sentences)} sentences from text")
         return sentences
@@ -375,6 +437,27 @@ class DocumentProcessor:
             "metadata": extraction_result.get("metadata", {})
         }
 
+    async def iter_sentences_for_verification(self, file_path: str) -> Tuple[int, Iterator[Dict]]:
+        """
+        Process main document for verification without materializing every sentence.
+
+        Only the sentence spans are held in memory; sentence dictionaries (with
+        page numbers) are built as the caller consumes the iterator.
+
+        Args:
+            file_path: Path to main document
+
+        Returns:
+            Tuple of (total sentence count, iterator of sentence dictionaries)
+        """
+        extraction_result = await self.extract_text(file_path)
+        full_text = extraction_result["full_text"]
+        # Sentence tokenization is CPU-bound; keep it off the event loop
+        spans = await asyncio.to_thread(self.sentence_spans, full_text)
+        logger.info(f"Located {len(spans)} sentences in {file_path}")
+
+        return len(spans), self.iter_sentences(full_text, spans, extraction_result.get("pages") or None)
+
     async def process_document_for_verification(self, file_path: str) -> Dict:
         """
         Process main document for verification (sentence extraction).
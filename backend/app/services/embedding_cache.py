@@ -0,0 +1,64 @@
+"""Process-local LRU cache of text embeddings keyed by content hash and model."""
+
+from typing import List, Optional
+import hashlib
+import threading
+
+import numpy as np
+from cachetools import LRUCache
+
+from app.core.config import settings
+
+
+class EmbeddingCache:
+    """Thread-safe LRU of embedding vectors keyed by blake2b(text) + model."""
+
+    def __init__(self, maxsize: int = None):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Max cached vectors (default EMBED_CACHE_SIZE)
+        """
+        self._cache: LRUCache = LRUCache(maxsize=maxsize or settings.EMBED_CACHE_SIZE)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text: str, model: str) -> str:
+        """Cache key for a text under a given embedding model."""
+        return f"{hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()}:{model}"
+
+    def get_many(self, texts: List[str], model: str) -> List[Optional[np.ndarray]]:
+        """
+        Look up embeddings for several texts.
+
+        Args:
+            texts: Texts to look up
+            model: Embedding model name
+
+        Returns:
+            Cached vectors in input order, None for misses
+        """
+        keys = [self.key(text, model) for text in texts]
+        with self._lock:
+            return [self._cache.get(key) for key in keys]
+
+    def set_many(self, texts: List[str], model: str, vectors: np.ndarray):
+        """
+        Store embeddings for several texts.
+
+        Args:
+            texts: Embedded texts
+            model: Embedding model name
+            vectors: Vectors in the same order as `texts`
+        """
+        keys = [self.key(text, model) for text in texts]
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                vector = np.array(vector, dtype=np.float32)
+                vector.setflags(write=False)  # shared between callers
+                self._cache[key] = vector
+
+
+# Singleton instance
+embedding_cache = EmbeddingCache()
@@ -3,10 +3,12 @@
 from typing import List, Union
 from loguru import logger
 from openai import AsyncOpenAI
+import numpy as np
 from tenacity import retry, stop_after_attempt, wait_exponential
 import asyncio
 
 from app.core.config import settings
+from app.services.embedding_cache import embedding_cache
 
 
 class EmbeddingService:
@@ -24,7 +26,7 @@ class EmbeddingService:
         wait=wait_exponential(multiplier=1, min=2, max=10),
         reraise=True
     )
-    async def embed_text(self, text: str) -> List[float]:
+    async def embed_text(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text.
 
@@ -32,8 +34,12 @@ class EmbeddingService:
             text: Text to embed
 
         Returns:
-            Embedding vector (3072 dimensions)
+            float32 embedding vector (3072 dimensions)
         """
+        cached = embedding_cache.get_many([text], self.model)[0]
+        if cached is not None:
+            return cached
+
         try:
             response = await self.client.embeddings.create(
                 model=self.model,
@@ -41,8 +47,9 @@ class EmbeddingService:
                 dimensions=self.dimension
             )
 
-            embedding = response.data[0].embedding
+            embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
             logger.debug(f"Generated embedding for text (length: {len(text)})")
+            embedding_cache.set_many([text], self.model, [embedding])
             return embedding
 
         except Exception as e:
@@ -54,7 +61,29 @@ class EmbeddingService:
         wait=wait_exponential(multiplier=1, min=2, max=10),
         reraise=True
     )
-    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+    async def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for a list of texts in a single API request.
+
+        Args:
+            texts: Texts to embed (at most the API's per-request input limit)
+
+        Returns:
+            float32 array of shape (len(texts), dimension), in input order
+        """
+        try:
+            response = await self.client.embeddings.create(
+                model=self.model,
+                input=texts,
+                dimensions=self.dimension
+            )
+            return np.asarray([item.embedding for item in response.data], dtype=np.float32)
+
+        except Exception as e:
+            logger.error(f"Error generating embeddings: {e}")
+            raise
+
+    async def embed_batch(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for multiple texts in batch.
 
@@ -62,28 +91,33 @@ class EmbeddingService:
             texts: List of texts to embed
 
         Returns:
-            List of embedding vectors
+            float32 array of shape (len(texts), dimension)
         """
         try:
+            # Only texts missing from the cache go to the API
+            cached = embedding_cache.get_many(texts, self.model)
+            miss_idx = [i for i, vec in enumerate(cached) if vec is None]
+            misses = [texts[i] for i in miss_idx]
+
             # Process in batches to respect API limits
             all_embeddings = []
 
-            for i in range(0, len(texts), self.batch_size):
-                batch = texts[i:i + self.batch_size]
-
-                response = await self.client.embeddings.create(
-                    model=self.model,
-                    input=batch,
-                    dimensions=self.dimension
-                )
+            for i in range(0, len(misses), self.batch_size):
+                batch = misses[i:i + self.batch_size]
 
-                # Extract embeddings in order
-                embeddings = [item.embedding for item in response.data]
-                all_embeddings.extend(embeddings)
+                embeddings = await self.embed_texts(batch)
+                embedding_cache.set_many(batch, self.model, embeddings)
+                all_embeddings.append(embeddings)
 
                 logger.info(f"Generated embeddings for batch {i//self.batch_size + 1} ({len(batch)} texts)")
 
-            return all_embeddings
+            result = np.empty((len(texts), self.dimension), dtype=np.float32)
+            for i, vec in enumerate(cached):
+                if vec is not None:
+                    result[i] = vec
+            if miss_idx:
+                result[miss_idx] = self._stack(all_embeddings)
+            return result
 
         except Exception as e:
             logger.error(f"Error generating batch embeddings: {e}")
@@ -93,7 +127,7 @@ class EmbeddingService:
         self,
         documents: List[str],
         show_progress: bool = False
-    ) -> List[List[float]]:
+    ) -> np.ndarray:
         """
         Embed multiple documents with progress tracking.
 
@@ -102,7 +136,7 @@ class EmbeddingService:
             show_progress: Whether to log progress
 
         Returns:
-            List of embeddings
+            float32 array of shape (len(documents), dimension)
         """
         embeddings = []
         total_batches = (len(documents) + self.batch_size - 1) // self.batch_size
@@ -110,13 +144,19 @@ class EmbeddingService:
         for i in range(0, len(documents), self.batch_size):
             batch = documents[i:i + self.batch_size]
             batch_embeddings = await self.embed_batch(batch)
-            embeddings.extend(batch_embeddings)
+            embeddings.append(batch_embeddings)
 
             if show_progress:
                 current_batch = i // self.batch_size + 1
                 logger.info(f"Progress: {current_batch}/{total_batches} batches completed")
 
-        return embeddings
+        return self._stack(embeddings)
+
+    def _stack(self, batches: List[np.ndarray]) -> np.ndarray:
+        """Concatenate per-batch embedding arrays into one (N, dimension) array."""
+        if not batches:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        return np.concatenate(batches)
 
     def get_embedding_dimension(self) -> int:
         """Get the dimension of embeddings."""
@@ -124,8 +164,8 @@ class EmbeddingService:
 
     async def compute_similarity(
         self,
-        embedding1: List[float],
-        embedding2: List[float]
+        embedding1: Union[np.ndarray, List[float]],
+        embedding2: Union[np.ndarray, List[float]]
     ) -> float:
         """
         Compute cosine similarity between two embeddings.
@@ -137,10 +177,8 @@ class EmbeddingService:
         Returns:
             Cosine similarity score (0-1)
         """
-        import numpy as np
-
-        vec1 = np.array(embedding1)
-        vec2 = np.array(embedding2)
+        vec1 = np.asarray(embedding1, dtype=np.float32)
+        vec2 = np.asarray(embedding2, dtype=np.float32)
 
         # Cosine similarity
         similarity = np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
@@ -4,14 +4,19 @@ Mistral AI provides superior document understanding with OCR capabilities,
 making it ideal for extracting structured information from PDFs and documents.
 """
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from pathlib import Path
 from loguru import logger
-from mistralai import Mistral
-from pydantic import BaseModel, Field
-from tenacity import retry, stop_after_attempt, wait_exponential
-import json
-import base64
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+import asyncio
+import binascii
+import hashlib
+import io
+import aiofiles
+import httpx
+import orjson
+import redis.asyncio as aioredis
 
 from app.core.config import settings
 
@@ -19,6 +24,8 @@ from app.core.config import settings
 # Pydantic models for structured extraction
 class DocumentSection(BaseModel):
     """Structured section extracted from document."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     heading: str = Field(description="Section title or heading")
     content: str = Field(description="Section text content")
     start_char: int = Field(default=0, description="Character start position")
@@ -28,6 +35,8 @@ class DocumentSection(BaseModel):
 
 class DocumentCitation(BaseModel):
     """Citation extracted from document."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     text: str = Field(description="Exact citation text")
     reference: str = Field(description="What it references")
     page_number: int = Field(description="Page number where citation appears")
@@ -36,6 +45,8 @@ class DocumentCitation(BaseModel):
 
 class DocumentTable(BaseModel):
     """Table extracted from document."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     title: str = Field(description="Table title")
     data: str = Field(description="Structured table data")
     page_number: int = Field(description="Page number")
@@ -43,6 +54,8 @@ class DocumentTable(BaseModel):
 
 class DocumentKeyFact(BaseModel):
     """Key fact extracted from document."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     fact: str = Field(description="Important fact or figure")
     page_number: int = Field(description="Page number")
     context: str = Field(description="Surrounding context")
@@ -50,6 +63,8 @@ class DocumentKeyFact(BaseModel):
 
 class DocumentExtraction(BaseModel):
     """Complete structured extraction from a document page."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     page_number: int = Field(description="Page number")
     sections: List[DocumentSection] = Field(default_factory=list, description="Document sections")
     citations: List[DocumentCitation] = Field(default_factory=list, description="Citations found")
@@ -59,6 +74,8 @@ class DocumentExtraction(BaseModel):
 
 class CitationDetail(BaseModel):
     """Detailed citation with context."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     cited_text: str = Field(description="Exact text being cited")
     page_number: int = Field(description="Page number")
     reference_type: str = Field(description="financial_data|legal_reference|external_source|internal_cross_reference")
@@ -70,7 +87,10 @@ class CitationDetail(BaseModel):
 
 class VerificationCitation(BaseModel):
     """Citation for verification result."""
-    source_page: str = Field(description="Page number from evidence")
+    # Models often return the page as a number
+    model_config = ConfigDict(frozen=True, extra='ignore', coerce_numbers_to_str=True)
+
+    source_page: str = Field(default="Unknown", description="Page number from evidence")
     cited_text: str = Field(description="EXACT quote from source")
     relevance: str = Field(description="How this supports or contradicts the claim")
     similarity_score: float = Field(default=0.85, description="Similarity score 0-1")
@@ -80,6 +100,8 @@ class VerificationCitation(BaseModel):
 
 class VerificationResult(BaseModel):
     """Verification result with citations."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     validation_result: str = Field(description="VALIDATED|UNCERTAIN|INCORRECT")
     confidence_score: float = Field(description="Confidence score 0-1")
     reasoning: str = Field(description="Detailed explanation")
@@ -87,15 +109,109 @@ class VerificationResult(BaseModel):
     key_findings: List[str] = Field(default_factory=list, description="Key findings")
 
 
+# JSON schemas sent as structured-output constraints; built once at import
+_DOC_EXTRACTION_SCHEMA = DocumentExtraction.model_json_schema()
+_CITATION_SCHEMA = CitationDetail.model_json_schema()
+_VERIFICATION_SCHEMA = VerificationResult.model_json_schema()
+_CITATION_LIST_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "citations": {
+            "type": "array",
+            "items": _CITATION_SCHEMA
+        }
+    },
+    "required": ["citations"],
+    "additionalProperties": False
+}
+
+
+# Bump whenever a prompt or schema changes so cached responses are invalidated
+_PROMPT_VERSION = "3"
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Only timeouts, transport failures, 429s and 5xx responses are worth retrying."""
+    if isinstance(exc, (asyncio.TimeoutError, httpx.TransportError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+
+_backoff = wait_random_exponential(multiplier=1, min=2, max=10)
+
+
+def _wait_retry_after(retry_state) -> float:
+    """Honour a Retry-After header on rate-limit errors, else back off with jitter."""
+    exc = retry_state.outcome.exception()
+    raw_response = getattr(exc, "raw_response", None)
+    retry_after = raw_response.headers.get("retry-after") if raw_response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), 60.0)
+        except ValueError:
+            pass
+    return _backoff(retry_state)
+
+
+# Deterministic failures (bad schema, auth, parse errors) fail fast instead of
+# burning two more paid calls
+_retry_transient = retry(
+    stop=stop_after_attempt(3),
+    wait=_wait_retry_after,
+    retry=retry_if_exception(_is_retryable),
+    reraise=True
+)
+
+
 class MistralService:
     """Service for PDF extraction using Mistral OCR API and structured outputs."""
 
     def __init__(self):
         """Initialize Mistral client."""
+        # Deferred so processes that never call Mistral don't pay for the SDK import
+        from mistralai import Mistral
+        from mistralai.models import ResponseFormat
+
         self.client = Mistral(api_key=settings.MISTRAL_API_KEY)
+
+        # The SDK re-validates plain-dict response formats (including the nested
+        # schemas) on every call but passes model instances straight through
+        self._extraction_format = ResponseFormat.model_validate(self._EXTRACTION_RESPONSE_FORMAT)
+        self._citation_format = ResponseFormat.model_validate(self._CITATION_RESPONSE_FORMAT)
+        self._verification_format = ResponseFormat.model_validate(self._VERIFICATION_RESPONSE_FORMAT)
+        self._json_object_format = ResponseFormat.model_validate(self._JSON_OBJECT_RESPONSE_FORMAT)
         self.model = settings.MISTRAL_MODEL
         self.temperature = settings.MISTRAL_TEMPERATURE
         self.max_tokens = settings.MISTRAL_MAX_TOKENS
+        self.redis = aioredis.Redis.from_url(settings.REDIS_URL) if settings.MISTRAL_CACHE_ENABLED else None
+
+    async def _cache_get(self, key: bytes) -> Optional[Any]:
+        """Return a memoized response, or None on miss or cache failure."""
+        if self.redis is None:
+            return None
+        try:
+            cached = await self.redis.get(key)
+        except Exception as e:
+            logger.warning("Mistral cache read failed: {}", e)
+            return None
+        return orjson.loads(cached) if cached is not None else None
+
+    async def _cache_set(self, key: bytes, value: Any) -> None:
+        """Memoize a response; cache failures never fail the request."""
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(key, orjson.dumps(value), ex=settings.MISTRAL_CACHE_TTL)
+        except Exception as e:
+            logger.warning("Mistral cache write failed: {}", e)
+
+    def _content_key(self, prefix: bytes, *parts: Any) -> bytes:
+        """Build a cache key from the request inputs, model and prompt version."""
+        digest = hashlib.sha256(
+            "|".join(str(p) for p in (*parts, self.model, _PROMPT_VERSION)).encode()
+        ).digest()
+        return prefix + digest
 
     # PROMPT TEMPLATES FOR DOCUMENT EXTRACTION
 
@@ -146,6 +262,37 @@ Classification rules:
 
 ALWAYS cite exact page numbers and quote the supporting text."""
 
+    # Per-call constants, shared across requests instead of rebuilt each time
+    _EXTRACTION_SYS_MSG = {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT}
+    _CITATION_SYS_MSG = {"role": "system", "content": CITATION_EXTRACTION_PROMPT}
+    _VERIFICATION_SYS_MSG = {"role": "system", "content": VERIFICATION_SYSTEM_PROMPT}
+
+    _EXTRACTION_RESPONSE_FORMAT = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "document_extraction",
+            "schema": _DOC_EXTRACTION_SCHEMA,
+            "strict": True
+        }
+    }
+    _CITATION_RESPONSE_FORMAT = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "citation_list",
+            "schema": _CITATION_LIST_SCHEMA,
+            "strict": True
+        }
+    }
+    _VERIFICATION_RESPONSE_FORMAT = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "verification_result",
+            "schema": _VERIFICATION_SCHEMA,
+            "strict": True
+        }
+    }
+    _JSON_OBJECT_RESPONSE_FORMAT = {"type": "json_object"}
+
     async def extract_text_from_pdf_ocr(
         self,
         pdf_path: str
@@ -160,40 +307,60 @@ ALWAYS cite exact page numbers and quote the supporting text."""
             Extracted text with page information
         """
         try:
-            # Read PDF file and encode to base64
-            with open(pdf_path, 'rb') as f:
-                pdf_data = f.read()
-
-            pdf_base64 = base64.b64encode(pdf_data).decode('utf-8')
+            # Read PDF file without blocking the event loop and encode to base64
+            async with aiofiles.open(pdf_path, 'rb') as f:
+                pdf_data = await f.read()
+
+            # OCR is deterministic for the same file bytes; blake2b is plenty for a cache key
+            digest = hashlib.blake2b(pdf_data, digest_size=16).digest()
+            cache_key = b"ocr:" + digest
+            cached = await self._cache_get(cache_key)
+            if cached is not None:
+                logger.info("Mistral OCR cache hit for {}", pdf_path)
+                cached["metadata"]["file_path"] = pdf_path
+                return cached
+
+            # Single C-level encode; base64 output is pure ASCII, so skip UTF-8 validation
+            pdf_base64 = binascii.b2a_base64(pdf_data, newline=False).decode('ascii')
+            del pdf_data
 
             # Use Mistral OCR API
-            logger.info(f"Processing PDF with Mistral OCR: {pdf_path}")
+            logger.info("Processing PDF with Mistral OCR: {}", pdf_path)
 
-            # Call OCR endpoint using client.ocr.process
-            ocr_response = self.client.ocr.process(
+            # Call OCR endpoint using the SDK's async variant so the event loop stays free
+            ocr_response = await self.client.ocr.process_async(
                 file={
                     "data": pdf_base64,
                     "mime_type": "application/pdf"
                 }
             )
+            # The encoded upload is ~1.33x the file size; don't hold it while parsing
+            del pdf_base64
 
-            logger.info(f"Mistral OCR completed for {pdf_path}")
+            logger.info("Mistral OCR completed for {}", pdf_path)
 
             # Process OCR response
             pages = []
             full_text = ""
 
             # Extract text from OCR response
-            if hasattr(ocr_response, 'pages'):
-                for page_num, page in enumerate(ocr_response.pages, 1):
-                    page_text = page.text if hasattr(page, 'text') else ""
+            ocr_pages = getattr(ocr_response, 'pages', None)
+            if ocr_pages is not None:
+                # Collect parts and join once; track offsets with a running counter
+                parts = []
+                offset = 0
+                for page_num, page in enumerate(ocr_pages, 1):
+                    page_text = getattr(page, 'text', "")
                     pages.append({
                         "page_number": page_num,
                         "text": page_text,
-                        "char_start": len(full_text),
-                        "char_end": len(full_text) + len(page_text)
+                        "char_start": offset,
+                        "char_end": offset + len(page_text)
                     })
-                    full_text += page_text + "\n"
+                    parts.append(page_text)
+                    parts.append("\n")
+                    offset += len(page_text) + 1
+                full_text = "".join(parts)
             elif hasattr(ocr_response, 'text'):
                 # Single text output
                 full_text = ocr_response.text
@@ -204,7 +371,7 @@ ALWAYS cite exact page numbers and quote the supporting text."""
                     "char_end": len(full_text)
                 })
 
-            return {
+            result = {
                 "full_text": full_text,
                 "pages": pages,
                 "page_count": len(pages),
@@ -213,17 +380,15 @@ ALWAYS cite exact page numbers and quote the supporting text."""
                     "file_path": pdf_path
                 }
             }
+            await self._cache_set(cache_key, result)
+            return result
 
         except Exception as e:
-            logger.error(f"Error in Mistral OCR extraction: {e}")
+            logger.error("Error in Mistral OCR extraction: {}", e)
             # Fallback to basic extraction if OCR fails
             raise
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        reraise=True
-    )
+    @_retry_transient
     async def extract_structured_content(
         self,
         page_text: str,
@@ -241,11 +406,17 @@ ALWAYS cite exact page numbers and quote the supporting text."""
         Returns:
             Structured extraction with citations and metadata
         """
+        title = (document_metadata or {}).get('title', 'IPO Document')
         try:
+            cache_key = self._content_key(b"extract:", page_text, page_number, title)
+            cached = await self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
             user_prompt = f"""Extract structured information from this IPO document page.
 
 **Page Number**: {page_number}
-**Document Context**: {document_metadata.get('title', 'IPO Document') if document_metadata else 'IPO Document'}
+**Document Context**: {title}
 
 **Page Content**:
 ```
@@ -254,31 +425,25 @@ ALWAYS cite exact page numbers and quote the supporting text."""
 
 Extract all sections, citations, tables, and key facts with precise positions."""
 
-            response = self.client.chat.complete(
+            response = await self.client.chat.complete_async(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": self.EXTRACTION_SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt}
-                ],
+                messages=[self._EXTRACTION_SYS_MSG, {"role": "user", "content": user_prompt}],
                 temperature=self.temperature,
                 max_tokens=self.max_tokens,
-                response_format={
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": "document_extraction",
-                        "schema": DocumentExtraction.model_json_schema(),
-                        "strict": True
-                    }
-                }
+                response_format=self._extraction_format
             )
 
             # Parse structured output
-            result = json.loads(response.choices[0].message.content)
-            logger.info(f"Extracted structured content from page {page_number}")
+            result = orjson.loads(response.choices[0].message.content)
+            logger.info("Extracted structured content from page {}", page_number)
+            await self._cache_set(cache_key, result)
             return result
 
         except Exception as e:
-            logger.error(f"Error in structured extraction: {e}")
+            if _is_retryable(e):
+                # Let tenacity back off and retry instead of degrading the page
+                raise
+            logger.error("Error in structured extraction: {}", e)
             return {
                 "page_number": page_number,
                 "sections": [{"heading": "", "content": page_text, "section_type": "paragraph"}],
@@ -287,11 +452,38 @@ Extract all sections, citations, tables, and key facts with precise positions.""
                 "key_facts": []
             }
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        reraise=True
-    )
+    async def extract_structured_content_batch(
+        self,
+        pages: List[Tuple[str, int]],
+        document_metadata: Optional[Dict] = None,
+        concurrency: Optional[int] = None
+    ) -> List[Any]:
+        """
+        Extract structured content from many pages concurrently.
+
+        Args:
+            pages: List of (page_text, page_number) tuples
+            document_metadata: Optional metadata about the document
+            concurrency: Max in-flight requests (defaults to MISTRAL_CONCURRENCY)
+
+        Returns:
+            Per-page extraction results in input order; a page that still fails
+            after retries is returned as its exception
+        """
+        sem = asyncio.Semaphore(concurrency or settings.MISTRAL_CONCURRENCY)
+
+        async def _one(page_text: str, page_number: int) -> Dict[str, Any]:
+            async with sem:
+                return await self.extract_structured_content(
+                    page_text, page_number, document_metadata
+                )
+
+        return await asyncio.gather(
+            *[_one(text, number) for text, number in pages],
+            return_exceptions=True
+        )
+
+    @_retry_transient
     async def extract_citations_from_page(
         self,
         page_text: str,
@@ -308,6 +500,11 @@ Extract all sections, citations, tables, and key facts with precise positions.""
             List of citations with exact positions
         """
         try:
+            cache_key = self._content_key(b"citations:", page_text, page_number)
+            cached = await self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
             user_prompt = f"""Extract ALL citations and references from this page with EXACT details.
 
 **Page Number**: {page_number}
@@ -319,49 +516,28 @@ Extract all sections, citations, tables, and key facts with precise positions.""
 
 If no citations found, return empty array."""
 
-            response = self.client.chat.complete(
+            response = await self.client.chat.complete_async(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": self.CITATION_EXTRACTION_PROMPT},
-                    {"role": "user", "content": user_prompt}
-                ],
+                messages=[self._CITATION_SYS_MSG, {"role": "user", "content": user_prompt}],
                 temperature=self.temperature,
                 max_tokens=self.max_tokens,
-                response_format={
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": "citation_list",
-                        "schema": {
-                            "type": "object",
-                            "properties": {
-                                "citations": {
-                                    "type": "array",
-                                    "items": CitationDetail.model_json_schema()
-                                }
-                            },
-                            "required": ["citations"],
-                            "additionalProperties": False
-                        },
-                        "strict": True
-                    }
-                }
+                response_format=self._citation_format
             )
 
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
             citations = result.get("citations", [])
 
-            logger.info(f"Extracted {len(citations)} citations from page {page_number}")
+            logger.info("Extracted {} citations from page {}", len(citations), page_number)
+            await self._cache_set(cache_key, citations)
             return citations
 
         except Exception as e:
-            logger.error(f"Error extracting citations: {e}")
+            if _is_retryable(e):
+                raise
+            logger.error("Error extracting citations: {}", e)
             return []
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        reraise=True
-    )
+    @_retry_transient
     async def verify_claim_with_citations(
         self,
         claim: str,
@@ -405,42 +581,40 @@ If no citations found, return empty array."""
 
 **Critical**: Always include exact page numbers and quotes!"""
 
-            response = self.client.chat.complete(
+            response = await self.client.chat.complete_async(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": self.VERIFICATION_SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt}
-                ],
+                messages=[self._VERIFICATION_SYS_MSG, {"role": "user", "content": user_prompt}],
                 temperature=self.temperature,
                 max_tokens=self.max_tokens,
-                response_format={
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": "verification_result",
-                        "schema": VerificationResult.model_json_schema(),
-                        "strict": True
-                    }
-                }
+                response_format=self._verification_format
             )
 
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
 
-            # Ensure citations have all required fields
-            citations = result.get("citations", [])
-            for citation in citations:
-                citation["page_number"] = citation.get("source_page", "Unknown")
-                if "similarity_score" not in citation:
-                    citation["similarity_score"] = 0.85  # Default high confidence
+            # Validate each citation on its own; defaults fill missing fields and a
+            # malformed one is dropped rather than failing the whole verdict
+            citations = []
+            for raw_citation in result.get("citations") or []:
+                try:
+                    citation = VerificationCitation.model_validate(raw_citation)
+                except ValidationError as e:
+                    logger.warning("Dropping malformed citation: {}", e)
+                    continue
+                citations.append({**citation.model_dump(), "page_number": citation.source_page})
+            result["citations"] = citations
 
             logger.info(
-                f"Verified claim with result: {result.get('validation_result')} "
-                f"({len(citations)} citations)"
+                "Verified claim with result: {} ({} citations)",
+                result.get('validation_result'),
+                len(citations),
             )
 
             return result
 
         except Exception as e:
-            logger.error(f"Error in claim verification: {e}")
+            if _is_retryable(e):
+                raise
+            logger.error("Error in claim verification: {}", e)
             return {
                 "validation_result": "UNCERTAIN",
                 "confidence_score": 0.0,
@@ -451,25 +625,26 @@ If no citations found, return empty array."""
 
     def _format_evidence_with_pages(self, evidence: List[Dict[str, Any]]) -> str:
         """Format evidence chunks with page numbers for the prompt."""
-        formatted = []
+        # Write straight into one buffer instead of allocating a string per chunk
+        buf = io.StringIO()
+        write = buf.write
 
         for idx, chunk in enumerate(evidence, 1):
-            page_num = chunk.get("page_number", "Unknown")
-            filename = chunk.get("filename", "Document")
-            content = chunk.get("content", "")
-            similarity = chunk.get("similarity", 0.0)
-
-            formatted.append(
-                f"""**Evidence {idx}** (Similarity: {similarity:.2%})
-Source: {filename}
-Page: {page_num}
-
-{content}
-
----"""
-            )
-
-        return "\n\n".join(formatted)
+            if idx > 1:
+                write("\n\n")
+            write("**Evidence ")
+            write(str(idx))
+            write("** (Similarity: ")
+            write(format(chunk.get("similarity", 0.0), ".2%"))
+            write(")\nSource: ")
+            write(str(chunk.get("filename", "Document")))
+            write("\nPage: ")
+            write(str(chunk.get("page_number", "Unknown")))
+            write("\n\n")
+            write(str(chunk.get("content", "")))
+            write("\n\n---")
+
+        return buf.getvalue()
 
     async def analyze_document_structure(
         self,
@@ -496,23 +671,20 @@ Page: {page_num}
 
 Identify document type, main sections, key pages, and metadata."""
 
-            response = self.client.chat.complete(
+            response = await self.client.chat.complete_async(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": self.EXTRACTION_SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt}
-                ],
+                messages=[self._EXTRACTION_SYS_MSG, {"role": "user", "content": user_prompt}],
                 temperature=self.temperature,
                 max_tokens=4096,
-                response_format={"type": "json_object"}
+                response_format=self._json_object_format
             )
 
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
             logger.info("Analyzed document structure")
             return result
 
         except Exception as e:
-            logger.error(f"Error analyzing document structure: {e}")
+            logger.error("Error analyzing document structure: {}", e)
             return {
                 "document_type": "Unknown",
                 "main_sections": [],
@@ -521,5 +693,13 @@ Identify document type, main sections, key pages, and metadata."""
             }
 
 
-# Singleton instance
-mistral_service = MistralService()
+# Lazily created singleton instance
+_mistral_service: Optional[MistralService] = None
+
+
+def get_mistral_service() -> MistralService:
+    """Return the shared MistralService, creating it on first use."""
+    global _mistral_service
+    if _mistral_service is None:
+        _mistral_service = MistralService()
+    return _mistral_service
@@ -0,0 +1,143 @@
+"""In-process semantic cache for claim verification results.
+
+Exact hits are keyed by (project, model, normalized sentence, evidence set);
+near-paraphrases are matched by cosine similarity of the sentence embedding,
+but only against entries that were verified with the identical evidence set,
+so a cached verdict is never reused for different supporting chunks.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import threading
+
+import numpy as np
+from cachetools import TTLCache
+from loguru import logger
+
+from app.core.config import settings
+
+# Paraphrase candidates kept per (project, model, evidence) group
+_MAX_GROUP_ENTRIES = 256
+
+
+def _digest(*parts: str) -> str:
+    """Short stable digest over the given strings."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class SemanticCache:
+    """TTL-bounded exact + embedding-similarity cache for verification results."""
+
+    def __init__(
+        self,
+        maxsize: int = None,
+        ttl: int = None,
+        threshold: float = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Max cached results (default SEMANTIC_CACHE_SIZE)
+            ttl: Entry lifetime in seconds (default SEMANTIC_CACHE_TTL)
+            threshold: Min cosine similarity for a paraphrase hit (default SEMANTIC_CACHE_THRESHOLD)
+        """
+        maxsize = maxsize or settings.SEMANTIC_CACHE_SIZE
+        ttl = ttl or settings.SEMANTIC_CACHE_TTL
+        self.threshold = threshold or settings.SEMANTIC_CACHE_THRESHOLD
+        self._exact: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # (project, model, evidence) -> list of (unit vector, exact key)
+        self._vectors: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def evidence_key(chunks: List[Dict], context: str = "") -> str:
+        """Order-independent digest of the evidence chunk ids plus the prompt context."""
+        return _digest(context, *sorted(str(c.get("chunk_id") or "") for c in chunks))
+
+    @staticmethod
+    def _exact_key(project_id: Any, model: str, sentence: str, evidence: str) -> str:
+        normalized = " ".join(sentence.lower().split())
+        return _digest(str(project_id), model, normalized, evidence)
+
+    @staticmethod
+    def _copy(result: Dict) -> Dict:
+        """Shallow-copy a result so callers can't mutate the cached entry."""
+        return {**result, "citations": [dict(c) for c in result.get("citations", [])]}
+
+    def get(
+        self,
+        project_id: Any,
+        model: str,
+        sentence: str,
+        evidence: str,
+        embedding: Optional[np.ndarray] = None
+    ) -> Optional[Dict]:
+        """
+        Look up a verification result.
+
+        Args:
+            project_id: Project UUID
+            model: LLM model name
+            sentence: Claim being verified
+            evidence: Evidence key from evidence_key()
+            embedding: Claim embedding for paraphrase matching
+
+        Returns:
+            Cached result copy, or None on miss
+        """
+        with self._lock:
+            result = self._exact.get(self._exact_key(project_id, model, sentence, evidence))
+            if result is None and embedding is not None:
+                entries = self._vectors.get((str(project_id), model, evidence))
+                if entries:
+                    query = np.asarray(embedding, dtype=np.float32)
+                    query = query / (np.linalg.norm(query) + 1e-12)
+                    matrix = np.stack([vec for vec, _ in entries])
+                    sims = matrix @ query
+                    best = int(np.argmax(sims))
+                    if sims[best] >= self.threshold:
+                        result = self._exact.get(entries[best][1])
+                        if result is not None:
+                            logger.debug("Semantic cache paraphrase hit (cosine {:.3f})", float(sims[best]))
+
+        return self._copy(result) if result is not None else None
+
+    def set(
+        self,
+        project_id: Any,
+        model: str,
+        sentence: str,
+        evidence: str,
+        result: Dict,
+        embedding: Optional[np.ndarray] = None
+    ):
+        """
+        Store a verification result.
+
+        Args:
+            project_id: Project UUID
+            model: LLM model name
+            sentence: Claim being verified
+            evidence: Evidence key from evidence_key()
+            result: Verification result to cache
+            embedding: Claim embedding for paraphrase matching
+        """
+        key = self._exact_key(project_id, model, sentence, evidence)
+        with self._lock:
+            self._exact[key] = self._copy(result)
+            if embedding is not None:
+                vec = np.asarray(embedding, dtype=np.float32)
+                vec = vec / (np.linalg.norm(vec) + 1e-12)
+                group_key = (str(project_id), model, evidence)
+                entries: List[Tuple[np.ndarray, str]] = list(self._vectors.get(group_key, []))
+                entries.append((vec, key))
+                self._vectors[group_key] = entries[-_MAX_GROUP_ENTRIES:]
+
+
+# Singleton instance
+semantic_cache = SemanticCache()
@@ -1,15 +1,42 @@
 """S3-compatible Storage service using boto3."""
 
-from typing import BinaryIO, Optional
+from typing import BinaryIO, Optional, Union
 from pathlib import Path
+import asyncio
+import io
+import os
 from uuid import UUID
+from concurrent.futures import ThreadPoolExecutor, wait
 import mimetypes
 from loguru import logger
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from botocore.config import Config
 
 from app.core.config import settings
+from app.helpers.project_ref import project_ref
+
+# One session/config per process: avoids reloading botocore's service model and
+# re-walking the credential chain for every client
+_SESSION = boto3.session.Session()
+_CONFIG = Config(
+    signature_version='s3v4',
+    s3={'addressing_style': 'path'},
+    # Enough pooled keep-alive connections for to_thread fan-out and multipart
+    # transfers, so bursts reuse TLS sessions instead of reconnecting
+    max_pool_connections=max(50, 4 * (os.cpu_count() or 1)),
+    retries={'max_attempts': 5, 'mode': 'adaptive'},
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=30
+)
+# Metadata probes (HEAD) should fail fast rather than hang a request
+_HEAD_CONFIG = _CONFIG.merge(Config(connect_timeout=2, read_timeout=5))
+
+
+# Shared pool for fanning out independent delete_objects calls (boto3 clients are thread-safe)
+_delete_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="s3-delete")
 
 
 class StorageService:
@@ -18,25 +45,35 @@ class StorageService:
     def __init__(self):
         """Initialize S3 client with boto3."""
         # Configure boto3 for S3-compatible storage (Supabase Storage)
-        self.s3_client = boto3.client(
+        self.s3_client = self._create_client(_CONFIG)
+        self._head_client = self._create_client(_HEAD_CONFIG)
+        self.bucket_name = settings.S3_BUCKET
+        # Parallel multipart transfers; Supabase/MinIO do better with larger parts than the 8MB default
+        self._transfer_config = TransferConfig(
+            multipart_threshold=16 * 1024 * 1024,
+            multipart_chunksize=16 * 1024 * 1024,
+            max_concurrency=10,
+            use_threads=True,
+            max_io_queue=100
+        )
+
+    @staticmethod
+    def _create_client(config: Config):
+        """Create an S3 client from the shared session."""
+        return _SESSION.client(
             's3',
             endpoint_url=settings.S3_ENDPOINT,
             aws_access_key_id=settings.S3_ACCESS_KEY_ID,
             aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY,
             region_name=settings.S3_REGION,
-            config=Config(
-                signature_version='s3v4',
-                s3={'addressing_style': 'path'}
-            )
+            config=config
         )
-        self.bucket_name = settings.S3_BUCKET
-        self._ensure_bucket_exists()
 
-    def _ensure_bucket_exists(self):
+    def ensure_bucket_exists(self):
         """Create storage bucket if it doesn't exist."""
         try:
             # Try to check if bucket exists
-            self.s3_client.head_bucket(Bucket=self.bucket_name)
+            self._head_client.head_bucket(Bucket=self.bucket_name)
             logger.info(f"S3 bucket '{self.bucket_name}' already exists")
         except ClientError as e:
             error_code = e.response['Error']['Code']
@@ -58,7 +95,7 @@ class StorageService:
 
     def upload_file(
         self,
-        file: BinaryIO,
+        file: Union[BinaryIO, bytes],
         filename: str,
         project_id: UUID,
         content_type: Optional[str] = None
@@ -67,7 +104,7 @@ class StorageService:
         Upload file to S3 storage.
 
         Args:
-            file: File object to upload
+            file: File object to upload (streamed, never read fully into memory) or raw bytes
             filename: Original filename
             project_id: Project UUID for organization
             content_type: MIME type of the file
@@ -77,7 +114,7 @@ class StorageService:
         """
         try:
             # Generate storage path: projects/{project_id}/{filename}
-            storage_path = f"projects/{str(project_id)}/{filename}"
+            storage_path = f"{project_ref(project_id).prefix}{filename}"
 
             # Detect content type if not provided
             if not content_type:
@@ -85,19 +122,22 @@ class StorageService:
                 if not content_type:
                     content_type = "application/octet-stream"
 
-            # Read file data
-            file_data = file.read()
+            if isinstance(file, (bytes, bytearray)):
+                file = io.BytesIO(file)
 
-            # Upload to S3
-            self.s3_client.put_object(
+            # Stream to S3; s3transfer switches to multipart for large bodies
+            self.s3_client.upload_fileobj(
+                Fileobj=file,
                 Bucket=self.bucket_name,
                 Key=storage_path,
-                Body=file_data,
-                ContentType=content_type,
-                Metadata={
-                    'project_id': str(project_id),
-                    'original_filename': filename
-                }
+                ExtraArgs={
+                    'ContentType': content_type,
+                    'Metadata': {
+                        'project_id': project_ref(project_id).s,
+                        'original_filename': filename
+                    }
+                },
+                Config=self._transfer_config
             )
 
             logger.info(f"Uploaded file to S3 storage: {storage_path}")
@@ -107,29 +147,44 @@ class StorageService:
             logger.error(f"Error uploading file to S3 storage: {e}")
             raise
 
-    def download_file(self, storage_path: str) -> bytes:
+    def download_file_stream(self, storage_path: str, fileobj: BinaryIO):
         """
-        Download file from S3 storage.
+        Stream a file from S3 storage into a caller-provided file object.
+
+        Large objects are fetched as concurrent ranged GETs, so prefer this
+        over download_file when the caller can write to disk or a stream.
 
         Args:
             storage_path: Path to file in storage
-
-        Returns:
-            File content as bytes
+            fileobj: Writable binary file object
         """
         try:
-            response = self.s3_client.get_object(
+            self.s3_client.download_fileobj(
                 Bucket=self.bucket_name,
-                Key=storage_path
+                Key=storage_path,
+                Fileobj=fileobj,
+                Config=self._transfer_config
             )
-            file_data = response['Body'].read()
             logger.info(f"Downloaded file from S3 storage: {storage_path}")
-            return file_data
 
         except Exception as e:
             logger.error(f"Error downloading file from S3 storage: {e}")
             raise
 
+    def download_file(self, storage_path: str) -> bytes:
+        """
+        Download file from S3 storage.
+
+        Args:
+            storage_path: Path to file in storage
+
+        Returns:
+            File content as bytes
+        """
+        buffer = io.BytesIO()
+        self.download_file_stream(storage_path, buffer)
+        return buffer.getvalue()
+
     def get_public_url(self, storage_path: str) -> str:
         """
         Get public URL for a file (if bucket is public).
@@ -175,6 +230,43 @@ class StorageService:
             logger.error(f"Error creating signed URL: {e}")
             raise
 
+    def generate_upload_url(
+        self,
+        filename: str,
+        project_id: UUID,
+        content_type: str,
+        expires_in: int = 3600
+    ) -> dict:
+        """
+        Create a presigned POST so clients upload straight to S3 storage.
+
+        Args:
+            filename: Storage filename
+            project_id: Project UUID for organization
+            content_type: MIME type the upload must declare
+            expires_in: URL expiration time in seconds (default: 1 hour)
+
+        Returns:
+            Dict with 'url', 'fields' and the resulting 'storage_path'
+        """
+        try:
+            storage_path = f"{project_ref(project_id).prefix}{filename}"
+            presigned = self.s3_client.generate_presigned_post(
+                Bucket=self.bucket_name,
+                Key=storage_path,
+                Fields={'Content-Type': content_type},
+                Conditions=[
+                    ['content-length-range', 0, settings.MAX_UPLOAD_SIZE],
+                    {'Content-Type': content_type}
+                ],
+                ExpiresIn=expires_in
+            )
+            return {**presigned, 'storage_path': storage_path}
+
+        except Exception as e:
+            logger.error(f"Error creating presigned upload: {e}")
+            raise
+
     def delete_file(self, storage_path: str):
         """
         Delete file from S3 storage.
@@ -202,23 +294,33 @@ class StorageService:
         """
         try:
             # List all files in project folder
-            project_path = f"projects/{str(project_id)}/"
-
-            # List objects with prefix
-            response = self.s3_client.list_objects_v2(
+            project_path = project_ref(project_id).prefix
+
+            # Each page holds at most the 1000 keys delete_objects accepts; delete pages
+            # concurrently while the paginator keeps listing
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            futures = []
+            deleted = 0
+            for page in paginator.paginate(
                 Bucket=self.bucket_name,
-                Prefix=project_path
-            )
-
-            # Delete all files
-            if 'Contents' in response:
-                objects_to_delete = [{'Key': obj['Key']} for obj in response['Contents']]
+                Prefix=project_path,
+                PaginationConfig={'PageSize': 1000}
+            ):
+                objects_to_delete = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
                 if objects_to_delete:
-                    self.s3_client.delete_objects(
+                    futures.append(_delete_executor.submit(
+                        self.s3_client.delete_objects,
                         Bucket=self.bucket_name,
-                        Delete={'Objects': objects_to_delete}
-                    )
-                    logger.info(f"Deleted all files for project {project_id}")
+                        Delete={'Objects': objects_to_delete, 'Quiet': True}
+                    ))
+                    deleted += len(objects_to_delete)
+
+            wait(futures)
+            for future in futures:
+                future.result()
+
+            if deleted:
+                logger.info(f"Deleted all {deleted} files for project {project_id}")
 
         except Exception as e:
             logger.error(f"Error deleting project files: {e}")
@@ -232,23 +334,27 @@ class StorageService:
             project_id: Project UUID
 
         Returns:
-            List of file metadata
+            List of file metadata, in the same shape as get_file_info minus
+            user metadata, so callers don't need a HEAD per file
         """
         try:
-            project_path = f"projects/{str(project_id)}/"
-
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=project_path
-            )
+            project_path = project_ref(project_id).prefix
 
             files = []
-            if 'Contents' in response:
-                for obj in response['Contents']:
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(
+                Bucket=self.bucket_name,
+                Prefix=project_path,
+                PaginationConfig={'PageSize': 1000}
+            ):
+                for obj in page.get('Contents', []):
+                    name = obj['Key'].split('/')[-1]
                     files.append({
-                        'name': obj['Key'].split('/')[-1],
+                        'name': name,
                         'key': obj['Key'],
                         'size': obj['Size'],
+                        # Listings carry no Content-Type; guess it rather than HEAD every key
+                        'content_type': mimetypes.guess_type(name)[0] or 'application/octet-stream',
                         'last_modified': obj['LastModified'].isoformat(),
                         'etag': obj['ETag']
                     })
@@ -270,7 +376,7 @@ class StorageService:
             File metadata
         """
         try:
-            response = self.s3_client.head_object(
+            response = self._head_client.head_object(
                 Bucket=self.bucket_name,
                 Key=storage_path
             )
@@ -289,6 +395,65 @@ class StorageService:
             logger.error(f"Error getting file info: {e}")
             raise
 
+    # Async variants: run the blocking boto3 call on the default thread pool so
+    # route handlers don't stall the event loop for a full S3 round trip
+
+    async def aupload_file(
+        self,
+        file: Union[BinaryIO, bytes],
+        filename: str,
+        project_id: UUID,
+        content_type: Optional[str] = None
+    ) -> str:
+        """Async variant of upload_file."""
+        return await asyncio.to_thread(self.upload_file, file, filename, project_id, content_type)
+
+    async def adownload_file(self, storage_path: str) -> bytes:
+        """Async variant of download_file."""
+        return await asyncio.to_thread(self.download_file, storage_path)
+
+    async def adownload_file_stream(self, storage_path: str, fileobj: BinaryIO):
+        """Async variant of download_file_stream."""
+        await asyncio.to_thread(self.download_file_stream, storage_path, fileobj)
+
+    async def aget_signed_url(self, storage_path: str, expires_in: int = 3600) -> str:
+        """Async variant of get_signed_url."""
+        return await asyncio.to_thread(self.get_signed_url, storage_path, expires_in)
+
+    async def agenerate_upload_url(
+        self,
+        filename: str,
+        project_id: UUID,
+        content_type: str,
+        expires_in: int = 3600
+    ) -> dict:
+        """Async variant of generate_upload_url."""
+        return await asyncio.to_thread(self.generate_upload_url, filename, project_id, content_type, expires_in)
+
+    async def adelete_file(self, storage_path: str):
+        """Async variant of delete_file."""
+        await asyncio.to_thread(self.delete_file, storage_path)
+
+    async def adelete_project_files(self, project_id: UUID):
+        """Async variant of delete_project_files."""
+        await asyncio.to_thread(self.delete_project_files, project_id)
+
+    async def alist_project_files(self, project_id: UUID) -> list:
+        """Async variant of list_project_files."""
+        return await asyncio.to_thread(self.list_project_files, project_id)
+
+    async def aget_file_info(self, storage_path: str) -> dict:
+        """Async variant of get_file_info."""
+        return await asyncio.to_thread(self.get_file_info, storage_path)
+
+
+# Lazily created singleton instance
+_storage_service: Optional[StorageService] = None
+
 
-# Singleton instance
-storage_service = StorageService()
+def get_storage_service() -> StorageService:
+    """Return the shared StorageService, creating it on first use."""
+    global _storage_service
+    if _storage_service is None:
+        _storage_service = StorageService()
+    return _storage_service
@@ -1,16 +1,18 @@
 """Weaviate vector store service for semantic search with OpenAI embeddings."""
 
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Set, Tuple
 from uuid import UUID
 import weaviate
 from weaviate.classes.init import Auth
-from weaviate.classes.query import MetadataQuery
+from weaviate.classes.query import Filter, MetadataQuery
 from weaviate.classes.config import Property, DataType, Configure
 from loguru import logger
 import asyncio
+import numpy as np
 
 from app.core.config import settings
 from app.services.embedding_service import embedding_service
+from app.helpers.project_ref import project_ref
 
 
 class VectorStoreService:
@@ -19,6 +21,10 @@ class VectorStoreService:
     def __init__(self):
         """Initialize Weaviate client."""
         self.client = None
+        # Collection handles per project, so hot paths skip collections.get()
+        self._collection_cache: Dict[str, Any] = {}
+        # Collections known to exist, so create_schema only hits Weaviate once per project
+        self._schema_created: Set[str] = set()
         self._initialize_client()
 
     def _initialize_client(self):
@@ -52,6 +58,50 @@ class VectorStoreService:
             logger.error(f"Error initializing Weaviate client: {e}")
             raise
 
+    def _get_collection(self, project_id: UUID):
+        """Return the (cached) Weaviate collection handle for a project."""
+        collection_name = project_ref(project_id).collection
+        collection = self._collection_cache.get(collection_name)
+        if collection is None:
+            collection = self.client.collections.get(collection_name)
+            self._collection_cache[collection_name] = collection
+        return collection
+
+    @staticmethod
+    def _pq_segments() -> int:
+        """PQ segment count for the configured embedding dimension."""
+        dimension = settings.OPENAI_EMBEDDING_DIMENSION
+        segments = settings.WEAVIATE_PQ_SEGMENTS
+        if segments:
+            if dimension % segments:
+                raise ValueError(
+                    f"WEAVIATE_PQ_SEGMENTS={segments} does not divide embedding dimension {dimension}"
+                )
+            return segments
+        # Aim for ~32 dims per code (96 segments at 3072-d), stepping down to a divisor
+        for dims_per_segment in (32, 24, 16, 12, 8, 6, 4, 3, 2, 1):
+            if dimension % dims_per_segment == 0:
+                return dimension // dims_per_segment
+
+    @classmethod
+    def _vector_index_config(cls):
+        """HNSW config with the configured quantizer (3072-d float vectors are 12KB each uncompressed)."""
+        quantizer = settings.WEAVIATE_QUANTIZER.lower()
+        if quantizer == "pq":
+            quantizer_config = Configure.VectorIndex.Quantizer.pq(
+                segments=cls._pq_segments(), training_limit=100000
+            )
+        elif quantizer == "bq":
+            quantizer_config = Configure.VectorIndex.Quantizer.bq()
+        else:
+            quantizer_config = None
+
+        return Configure.VectorIndex.hnsw(
+            max_connections=32,
+            ef_construction=128,
+            quantizer=quantizer_config,
+        )
+
     def create_schema(self, project_id: UUID):
         """
         Create Weaviate schema for a project.
@@ -60,11 +110,14 @@ class VectorStoreService:
             project_id: Project UUID
         """
         try:
-            collection_name = f"Project_{str(project_id).replace('-', '_')}"
+            collection_name = project_ref(project_id).collection
+            if collection_name in self._schema_created:
+                return
 
             # Check if collection exists
             if self.client.collections.exists(collection_name):
                 logger.info(f"Collection {collection_name} already exists")
+                self._schema_created.add(collection_name)
                 return
 
             # Create collection
@@ -114,15 +167,21 @@ class VectorStoreService:
                 ],
                 # We provide vectors manually via embedding_service, so disable built-in vectorizer
                 vectorizer_config=Configure.Vectorizer.none(),
+                vector_index_config=self._vector_index_config(),
             )
 
+            self._schema_created.add(collection_name)
             logger.info(f"Created Weaviate collection: {collection_name}")
 
         except Exception as e:
             logger.error(f"Error creating Weaviate schema: {e}")
             raise
 
-    async def embed_text(self, text: str) -> List[float]:
+    async def acreate_schema(self, project_id: UUID):
+        """Async variant of create_schema; runs the blocking Weaviate calls in a worker thread."""
+        await asyncio.to_thread(self.create_schema, project_id)
+
+    async def embed_text(self, text: str) -> np.ndarray:
         """
         Generate embedding for text using OpenAI.
 
@@ -130,11 +189,11 @@ class VectorStoreService:
             text: Text to embed
 
         Returns:
-            Embedding vector (3072 dimensions for text-embedding-3-large)
+            float32 embedding vector (3072 dimensions for text-embedding-3-large)
         """
+        # Repeat queries are served from EmbeddingService's content-hash cache
         try:
-            embedding = await embedding_service.embed_text(text)
-            return embedding
+            return await embedding_service.embed_text(text)
         except Exception as e:
             logger.error(f"Error generating embedding: {e}")
             raise
@@ -161,21 +220,27 @@ class VectorStoreService:
             List of Weaviate object IDs
         """
         try:
-            collection_name = f"Project_{str(project_id).replace('-', '_')}"
-            collection = self.client.collections.get(collection_name)
+            collection = self._get_collection(project_id)
 
             weaviate_ids = []
 
-            # Embed and send sequentially to avoid any batching issues
-            with collection.batch.dynamic() as batch_context:
-                for idx, chunk in enumerate(chunks):
-                    logger.info(
-                        f"[weaviate] Embedding chunk {idx + 1}/{len(chunks)} "
-                        f"(len={len(chunk['content'])})"
-                    )
+            # One embeddings request per batch, with a bounded number in flight
+            contents = [chunk["content"] for chunk in chunks]
+            batch_size = embedding_service.batch_size
+            semaphore = asyncio.Semaphore(settings.OPENAI_EMBEDDING_CONCURRENCY)
+
+            async def _embed(batch: List[str]) -> np.ndarray:
+                async with semaphore:
+                    return await embedding_service.embed_texts(batch)
 
-                    vector = await embedding_service.embed_text(chunk["content"])
+            batch_vectors = await asyncio.gather(*[
+                _embed(contents[i:i + batch_size]) for i in range(0, len(contents), batch_size)
+            ])
+            vectors = np.concatenate(batch_vectors) if batch_vectors else []
 
+            # Vectors are precomputed, so fixed-size batches let the client pipeline inserts
+            with collection.batch.fixed_size(batch_size=200, concurrent_requests=4) as batch_context:
+                for idx, (chunk, vector) in enumerate(zip(chunks, vectors)):
                     properties = {
                         "content": chunk["content"],
                         "document_id": str(document_id),
@@ -187,78 +252,175 @@ class VectorStoreService:
                         "document_type": document_type
                     }
 
+                    # Reuse the DB chunk id as the object id when the caller provides one
                     uuid = batch_context.add_object(
                         properties=properties,
-                        vector=vector
+                        vector=vector,
+                        uuid=chunk.get("id")
                     )
                     weaviate_ids.append(str(uuid))
-                    logger.info(f"[weaviate] Added chunk {idx + 1}/{len(chunks)} to batch")
+                    if idx % 100 == 0:
+                        logger.debug("[weaviate] Added chunk {}/{} to batch", idx + 1, len(chunks))
+
+            failed_objects = collection.batch.failed_objects
+            if failed_objects:
+                raise RuntimeError(
+                    f"Weaviate rejected {len(failed_objects)} of {len(chunks)} chunks: "
+                    f"{failed_objects[0].message}"
+                )
 
-            logger.info(f"Indexed {len(chunks)} chunks for document {document_id}")
+            logger.info(
+                f"Indexed {len(chunks)} chunks ({sum(len(c) for c in contents)} chars) "
+                f"for document {document_id}"
+            )
             return weaviate_ids
 
         except Exception as e:
             logger.error(f"Error indexing chunks: {e}")
             raise
 
-    async def search_similar(
+    @staticmethod
+    def _chunk_result(obj, similarity: float, source: str) -> Dict:
+        """Convert a Weaviate object into the chunk dict returned by searches."""
+        return {
+            "content": obj.properties["content"],
+            "document_id": obj.properties["document_id"],
+            "chunk_id": obj.properties.get("chunk_id"),
+            "page_number": obj.properties.get("page_number"),
+            "start_char": obj.properties.get("start_char"),
+            "end_char": obj.properties.get("end_char"),
+            "filename": obj.properties.get("filename"),
+            "document_type": obj.properties.get("document_type"),
+            "similarity": similarity,
+            "source": source
+        }
+
+    def _semantic_results(self, response, min_similarity: float) -> List[Dict]:
+        """Filter near_vector hits by similarity."""
+        results = []
+        missing_distance = 0
+        for obj in response.objects:
+            distance = obj.metadata.distance
+            if distance is None:
+                missing_distance += 1
+                continue  # semantic results require a distance
+
+            similarity = 1 - distance
+            if similarity >= min_similarity:
+                results.append(self._chunk_result(obj, similarity, "semantic"))
+
+        if missing_distance:
+            logger.warning(f"Semantic search skipped {missing_distance} results with missing distance")
+
+        logger.info(f"Found {len(results)} semantic chunks for query")
+        return results
+
+    def _hybrid_results(self, response) -> List[Dict]:
+        """Convert hybrid hits, keeping keyword-only matches at zero similarity."""
+        hybrid_results = []
+        missing_distance = 0
+        for obj in response.objects:
+            distance = obj.metadata.distance
+            if distance is None:
+                # Keep keyword-only hits but flag them and set minimal similarity
+                missing_distance += 1
+                hybrid_results.append(self._chunk_result(obj, 0.0, "hybrid_keyword_only"))
+            else:
+                hybrid_results.append(self._chunk_result(obj, 1 - distance, "hybrid"))
+
+        if missing_distance:
+            logger.warning(f"Hybrid search had {missing_distance} keyword-only results without distance")
+
+        logger.info(f"Found {len(hybrid_results)} hybrid chunks for query")
+        return hybrid_results
+
+    async def search_all(
         self,
         project_id: UUID,
         query: str,
-        limit: int = None,
-        min_similarity: float = None
-    ) -> List[Dict]:
+        modes: Tuple[str, ...] = ("semantic", "hybrid"),
+        semantic_limit: int = None,
+        hybrid_limit: int = None,
+        min_similarity: float = None,
+        alpha: float = None,
+        query_vector: Optional[np.ndarray] = None
+    ) -> Dict[str, List[Dict]]:
         """
-        Semantic search using embeddings (top-k up to 20-30 as requested).
-        """
-        try:
-            limit = limit or settings.SEMANTIC_TOP_K
-            min_similarity = min_similarity or settings.MIN_SIMILARITY_THRESHOLD
+        Run semantic and/or hybrid search with a single query embedding.
 
-            collection_name = f"Project_{str(project_id).replace('-', '_')}"
-            collection = self.client.collections.get(collection_name)
+        Both Weaviate queries are issued concurrently off the event loop.
 
-            query_vector = await self.embed_text(query)
+        Args:
+            project_id: Project UUID
+            query: Query text
+            modes: Which searches to run ("semantic", "hybrid")
+            semantic_limit: Max semantic results (default SEMANTIC_TOP_K)
+            hybrid_limit: Max hybrid results (default KEYWORD_TOP_K)
+            min_similarity: Semantic similarity cutoff (default MIN_SIMILARITY_THRESHOLD)
+            alpha: Hybrid weighting (default HYBRID_ALPHA)
+            query_vector: Precomputed query embedding (embedded here if omitted)
 
-            response = collection.query.near_vector(
-                near_vector=query_vector,
-                limit=limit,
-                return_metadata=MetadataQuery(distance=True)
-            )
+        Returns:
+            Dict mapping each requested mode to its result chunks
+        """
+        try:
+            collection = self._get_collection(project_id)
+            if query_vector is None:
+                query_vector = await self.embed_text(query)
+
+            calls = {}
+            if "semantic" in modes:
+                calls["semantic"] = asyncio.to_thread(
+                    collection.query.near_vector,
+                    near_vector=query_vector,
+                    limit=semantic_limit or settings.SEMANTIC_TOP_K,
+                    return_metadata=MetadataQuery(distance=True)
+                )
+            if "hybrid" in modes:
+                calls["hybrid"] = asyncio.to_thread(
+                    collection.query.hybrid,
+                    query=query,
+                    vector=query_vector,
+                    alpha=alpha or settings.HYBRID_ALPHA,
+                    limit=hybrid_limit or settings.KEYWORD_TOP_K,
+                    return_metadata=MetadataQuery(distance=True)
+                )
 
-            results = []
-            missing_distance = 0
-            for obj in response.objects:
-                distance = obj.metadata.distance
-                if distance is None:
-                    missing_distance += 1
-                    continue  # semantic results require a distance
-
-                similarity = 1 - distance
-                if similarity >= min_similarity:
-                    results.append({
-                        "content": obj.properties["content"],
-                        "document_id": obj.properties["document_id"],
-                        "chunk_id": obj.properties.get("chunk_id"),
-                        "page_number": obj.properties.get("page_number"),
-                        "start_char": obj.properties.get("start_char"),
-                        "end_char": obj.properties.get("end_char"),
-                        "filename": obj.properties.get("filename"),
-                        "document_type": obj.properties.get("document_type"),
-                        "similarity": similarity,
-                        "source": "semantic"
-                    })
-
-            if missing_distance:
-                logger.warning(f"Semantic search skipped {missing_distance} results with missing distance")
-
-            logger.info(f"Found {len(results)} semantic chunks for query")
+            responses = dict(zip(calls, await asyncio.gather(*calls.values())))
+
+            results = {}
+            if "semantic" in responses:
+                results["semantic"] = self._semantic_results(
+                    responses["semantic"],
+                    min_similarity or settings.MIN_SIMILARITY_THRESHOLD
+                )
+            if "hybrid" in responses:
+                results["hybrid"] = self._hybrid_results(responses["hybrid"])
             return results
 
         except Exception as e:
-            logger.error(f"Error searching similar chunks: {e}")
+            logger.error(f"Error searching chunks: {e}")
             raise
 
+    async def search_similar(
+        self,
+        project_id: UUID,
+        query: str,
+        limit: int = None,
+        min_similarity: float = None
+    ) -> List[Dict]:
+        """
+        Semantic search using embeddings (top-k up to 20-30 as requested).
+        """
+        results = await self.search_all(
+            project_id,
+            query,
+            modes=("semantic",),
+            semantic_limit=limit,
+            min_similarity=min_similarity
+        )
+        return results["semantic"]
+
     async def search_hybrid(
         self,
         project_id: UUID,
@@ -270,57 +432,14 @@ class VectorStoreService:
         Hybrid keyword + semantic search. Uses Weaviate hybrid search to capture exact
         keyword matches after retrieving semantic top-k.
         """
-        try:
-            limit = limit or settings.KEYWORD_TOP_K
-            alpha = alpha or settings.HYBRID_ALPHA
-
-            collection_name = f"Project_{str(project_id).replace('-', '_')}"
-            collection = self.client.collections.get(collection_name)
-
-            query_vector = await self.embed_text(query)
-
-            response = collection.query.hybrid(
-                query=query,
-                vector=query_vector,
-                alpha=alpha,
-                limit=limit,
-                return_metadata=MetadataQuery(distance=True)
-            )
-
-            hybrid_results = []
-            missing_distance = 0
-            for obj in response.objects:
-                distance = obj.metadata.distance
-                if distance is None:
-                    # Keep keyword-only hits but flag them and set minimal similarity
-                    similarity = 0.0
-                    missing_distance += 1
-                    source = "hybrid_keyword_only"
-                else:
-                    similarity = 1 - distance
-                    source = "hybrid"
-
-                hybrid_results.append({
-                    "content": obj.properties["content"],
-                    "document_id": obj.properties["document_id"],
-                    "chunk_id": obj.properties.get("chunk_id"),
-                    "page_number": obj.properties.get("page_number"),
-                    "start_char": obj.properties.get("start_char"),
-                    "end_char": obj.properties.get("end_char"),
-                    "filename": obj.properties.get("filename"),
-                    "document_type": obj.properties.get("document_type"),
-                    "similarity": similarity,
-                    "source": source
-                })
-
-            if missing_distance:
-                logger.warning(f"Hybrid search had {missing_distance} keyword-only results without distance")
-
-            logger.info(f"Found {len(hybrid_results)} hybrid chunks for query")
-            return hybrid_results
-        except Exception as e:
-            logger.error(f"Error running hybrid search: {e}")
-            raise
+        results = await self.search_all(
+            project_id,
+            query,
+            modes=("hybrid",),
+            hybrid_limit=limit,
+            alpha=alpha
+        )
+        return results["hybrid"]
 
     def delete_document_chunks(self, project_id: UUID, document_id: UUID):
         """
@@ -330,20 +449,29 @@ class VectorStoreService:
             project_id: Project UUID
             document_id: Document UUID
         """
+        self.delete_documents_chunks(project_id, [document_id])
+
+    def delete_documents_chunks(self, project_id: UUID, document_ids: List[UUID]):
+        """
+        Delete all chunks for several documents in one request.
+
+        Args:
+            project_id: Project UUID
+            document_ids: Document UUIDs
+        """
+        if not document_ids:
+            return
+
         try:
-            collection_name = f"Project_{str(project_id).replace('-', '_')}"
-            collection = self.client.collections.get(collection_name)
+            collection = self._get_collection(project_id)
 
-            # Delete chunks matching document_id
             collection.data.delete_many(
-                where={
-                    "path": ["document_id"],
-                    "operator": "Equal",
-                    "valueText": str(document_id)
-                }
+                where=Filter.by_property("document_id").contains_any(
+                    [str(document_id) for document_id in document_ids]
+                )
             )
 
-            logger.info(f"Deleted chunks for document {document_id}")
+            logger.info(f"Deleted chunks for {len(document_ids)} document(s) in project {project_id}")
 
         except Exception as e:
             logger.error(f"Error deleting document chunks: {e}")
@@ -357,8 +485,10 @@ class VectorStoreService:
             project_id: Project UUID
         """
         try:
-            collection_name = f"Project_{str(project_id).replace('-', '_')}"
+            collection_name = project_ref(project_id).collection
 
+            self._collection_cache.pop(collection_name, None)
+            self._schema_created.discard(collection_name)
             if self.client.collections.exists(collection_name):
                 self.client.collections.delete(collection_name)
                 logger.info(f"Deleted collection: {collection_name}")
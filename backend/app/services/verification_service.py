@@ -3,12 +3,19 @@
 from typing import List, Dict, Tuple, Optional
 from uuid import UUID
 from loguru import logger
+import asyncio
+import hashlib
+import json
+import re
+import numpy as np
+import orjson
 from google import genai
 from google.genai import types
 
 from app.core.config import settings
 from app.services.vector_store import vector_store
 from app.services.embedding_service import embedding_service
+from app.services.semantic_cache import semantic_cache
 
 try:
     import cohere
@@ -17,10 +24,104 @@ except ImportError:
     cohere = None
 from app.db.models import ValidationResult
 
+# Fallback for responses that wrap the JSON object in prose or markdown fences
+_JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Upper bound on claims sharing one Gemini call in verify_batch
+_MAX_CLAIMS_PER_CALL = 8
+
+# Local cross-encoder reranker (optional sentence-transformers dependency), loaded on first use
+_cross_encoder = None
+
+
+def _get_cross_encoder():
+    """Return the shared CrossEncoder, or None if disabled/unavailable."""
+    global _cross_encoder
+    if _cross_encoder is None and settings.LOCAL_RERANKER_ENABLED:
+        try:
+            from sentence_transformers import CrossEncoder
+            _cross_encoder = CrossEncoder(settings.LOCAL_RERANKER_MODEL)
+            logger.info(f"Loaded local reranker {settings.LOCAL_RERANKER_MODEL}")
+        except Exception as e:
+            logger.warning(f"Local reranker unavailable, using embedding cosine: {e}")
+            _cross_encoder = False
+    return _cross_encoder or None
+
+
+# Shared Cohere client so rerank calls reuse its connection pool
+_cohere_client = None
+_cohere_key: Optional[str] = None
+
+
+def _get_cohere():
+    """Return the shared Cohere ClientV2 for the configured API key, or None if unavailable."""
+    global _cohere_client, _cohere_key
+    if not (settings.COHERE_API_KEY and cohere):
+        return None
+    if _cohere_client is None or _cohere_key != settings.COHERE_API_KEY:
+        _cohere_client = ClientV2(api_key=settings.COHERE_API_KEY)
+        _cohere_key = settings.COHERE_API_KEY
+    return _cohere_client
+
+
+# Process-wide GEMINI_CONCURRENCY limit shared by concurrent verify_batch calls;
+# rebuilt when used from a different event loop
+_gemini_semaphore: Optional[asyncio.Semaphore] = None
+_gemini_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_gemini_semaphore() -> asyncio.Semaphore:
+    """Return the GEMINI_CONCURRENCY semaphore bound to the running event loop."""
+    global _gemini_semaphore, _gemini_semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _gemini_semaphore is None or _gemini_semaphore_loop is not loop:
+        _gemini_semaphore = asyncio.Semaphore(settings.GEMINI_CONCURRENCY)
+        _gemini_semaphore_loop = loop
+    return _gemini_semaphore
+
+
+def _chunk_key(chunk: Dict):
+    """Dedup key: the chunk id, or a short digest of the content head when it's missing."""
+    return chunk.get("chunk_id") or hashlib.blake2b(
+        chunk["content"][:256].encode("utf-8"), digest_size=8
+    ).digest()
+
+
+def _top_k_indices(scores: np.ndarray, k: Optional[int]) -> np.ndarray:
+    """Indices of the k highest scores, best first (partial sort when k < len)."""
+    k = len(scores) if k is None else min(k, len(scores))
+    if k < len(scores):
+        top_idx = np.argpartition(-scores, k - 1)[:k]
+        return top_idx[np.argsort(-scores[top_idx], kind="stable")]
+    return np.argsort(-scores, kind="stable")
+
+
+def _dedup_chunks(chunks: List[Dict]) -> List[Dict]:
+    """Drop repeated chunks, keeping the first occurrence."""
+    deduped = []
+    seen = set()
+    for chunk in chunks:
+        key = _chunk_key(chunk)
+        if key in seen:
+            continue
+        seen.add(key)
+        deduped.append(chunk)
+    return deduped
+
 
 class VerificationService:
     """Service for verifying document claims using AI."""
 
+    # Per-chunk evidence block for the verification prompts
+    _EVIDENCE_TMPL = (
+        "# Evidence {i}\n"
+        "- similarity: {sim:.2f}\n"
+        "- file: {fn}\n"
+        "- page: {pg}\n"
+        "- chunk_id: {cid}\n"
+        "## content:\n{content}\n"
+    )
+
     def __init__(self):
         """Initialize verification service with Gemini using new google-genai SDK."""
         # Initialize Google GenAI client
@@ -73,6 +174,37 @@ Respond ONLY with JSON:
 }}
 Rules:
 - VALIDATED or UNCERTAIN requires at least one citation; otherwise set INCORRECT.
+- Use multiple citations if needed to show support and conflicts."""
+
+        # Multi-claim template for claims that share the same evidence
+        self.batch_verification_template = """Claims to verify (verify each one independently):
+{claims}
+
+Background Context:
+{context}
+
+Supporting Evidence from Documents:
+{evidence}
+
+Respond ONLY with a JSON array containing one object per claim:
+[
+  {{
+    "claim_index": claim_index from the input,
+    "validation_result": "VALIDATED|UNCERTAIN|INCORRECT",
+    "confidence_score": 0.0-1.0,
+    "reasoning": "detailed rationale; note conflicts if any",
+    "citations": [
+      {{
+        "document": "filename",
+        "page": page_number,
+        "quote": "exact quote from source",
+        "relevance": "how this evidence relates to the claim"
+      }}
+    ]
+  }}
+]
+Rules:
+- VALIDATED or UNCERTAIN requires at least one citation; otherwise set INCORRECT.
 - Use multiple citations if needed to show support and conflicts."""
 
     async def verify_sentence(
@@ -95,80 +227,234 @@ Rules:
             Verification result with citations
         """
         try:
-            # Retrieve semantic + keyword (hybrid) chunks from vector store
-            candidate_limit = max(settings.RERANK_CANDIDATES, settings.SEMANTIC_TOP_K)
-            semantic_chunks = await vector_store.search_similar(
-                project_id=project_id,
-                query=sentence,
-                limit=candidate_limit,
-                min_similarity=settings.MIN_SIMILARITY_THRESHOLD
-            )
+            merged = await self._retrieve_evidence(sentence, project_id, top_k)
+            return await self._verify_with_evidence(sentence, project_id, merged, context)
 
-            hybrid_chunks = await vector_store.search_hybrid(
-                project_id=project_id,
-                query=sentence,
-                limit=settings.KEYWORD_TOP_K,
-                alpha=settings.HYBRID_ALPHA
-            )
+        except Exception as e:
+            logger.error(f"Error verifying sentence: {e}")
+            return self._error_result(e)
 
-            # Merge and deduplicate by chunk_id/content hash
-            merged = []
-            seen = set()
-            for chunk in semantic_chunks + hybrid_chunks:
-                key = chunk.get("chunk_id") or hash(chunk["content"])
-                if key in seen:
-                    continue
-                seen.add(key)
-                merged.append(chunk)
-
-            # Rerank top candidates using embedding similarity (cross-encoder surrogate)
-            reranked = await self._rerank_chunks(sentence, merged)
-            final_top_k = top_k or settings.RERANK_TOP_K
-            merged = reranked[: final_top_k]
-
-            if not merged:
-                logger.warning(f"No similar evidence found for sentence: {sentence[:100]}...")
-                return {
-                    "validation_result": ValidationResult.UNCERTAIN,
-                    "confidence_score": 0.0,
-                    "reasoning": "No supporting evidence found in the provided documents.",
-                    "citations": []
-                }
+    async def _retrieve_evidence(
+        self,
+        sentence: str,
+        project_id: UUID,
+        top_k: Optional[int] = None,
+        query_vec: Optional[np.ndarray] = None
+    ) -> List[Dict]:
+        """
+        Retrieve, merge and rerank evidence chunks for a sentence.
+
+        Args:
+            sentence: Sentence to verify
+            project_id: Project UUID
+            top_k: Number of chunks to keep after reranking
+            query_vec: Precomputed sentence embedding (embedded here if omitted)
 
-            # Format evidence for the prompt
-            evidence_text = self._format_evidence(merged)
+        Returns:
+            Top-ranked evidence chunks
+        """
+        # Retrieve semantic + keyword (hybrid) chunks concurrently in one vector-store call
+        candidate_limit = max(settings.RERANK_CANDIDATES, settings.SEMANTIC_TOP_K)
+        # Embed once; the same vector drives both searches and the cosine rerank
+        if query_vec is None:
+            query_vec = await vector_store.embed_text(sentence)
+        results = await vector_store.search_all(
+            project_id=project_id,
+            query=sentence,
+            semantic_limit=candidate_limit,
+            hybrid_limit=settings.KEYWORD_TOP_K,
+            min_similarity=settings.MIN_SIMILARITY_THRESHOLD,
+            alpha=settings.HYBRID_ALPHA,
+            query_vector=query_vec
+        )
+
+        # Merge and deduplicate by chunk_id (content digest fallback)
+        merged = _dedup_chunks(results["semantic"] + results["hybrid"])
+
+        # Rerank top candidates using embedding similarity (cross-encoder surrogate)
+        final_top_k = top_k or settings.RERANK_TOP_K
+        reranked = await self._rerank_chunks(sentence, merged, query_vec=query_vec, top_k=final_top_k)
+        return reranked[: final_top_k]
+
+    async def _cache_lookup(
+        self,
+        sentence: str,
+        project_id: UUID,
+        merged: List[Dict],
+        context: str,
+        query_vec: Optional[np.ndarray] = None
+    ) -> Tuple[Optional[Dict], Optional[str], Optional[np.ndarray]]:
+        """Return (cached result, evidence key, sentence vector) for the semantic cache."""
+        if not settings.SEMANTIC_CACHE_ENABLED:
+            return None, None, None
+
+        cache_evidence = semantic_cache.evidence_key(merged, context)
+        # verify_batch passes the vector it embedded for retrieval; verify_sentence
+        # doesn't, and its retrieval left the sentence in EmbeddingService's cache
+        sentence_vec = query_vec if query_vec is not None else await vector_store.embed_text(sentence)
+        cached = semantic_cache.get(project_id, self.model, sentence, cache_evidence, sentence_vec)
+        return cached, cache_evidence, sentence_vec
+
+    async def _generate(self, prompt: str) -> str:
+        """Run one Gemini JSON-mode generation and return the response text."""
+        response = await self.client.aio.models.generate_content(
+            model=self.model,
+            contents=prompt,
+            config=types.GenerateContentConfig(
+                system_instruction=self.system_prompt,
+                temperature=settings.GEMINI_TEMPERATURE,
+                max_output_tokens=settings.GEMINI_MAX_TOKENS,
+                response_mime_type='application/json',
+            ),
+        )
+        return response.text
+
+    async def _verify_with_evidence(
+        self,
+        sentence: str,
+        project_id: UUID,
+        merged: List[Dict],
+        context: str = "",
+        query_vec: Optional[np.ndarray] = None
+    ) -> Dict:
+        """
+        Verify a sentence against already-retrieved evidence.
 
-            # Create prompt using new SDK
-            human_prompt = self.verification_template.format(
-                claim=sentence,
-                context=context or "No additional context provided.",
-                evidence=evidence_text
+        Args:
+            sentence: Sentence to verify
+            project_id: Project UUID
+            merged: Evidence chunks from _retrieve_evidence
+            context: Background context for the project
+            query_vec: Sentence embedding from retrieval, reused for the semantic cache
+
+        Returns:
+            Verification result with citations
+        """
+        if not merged:
+            logger.warning(f"No similar evidence found for sentence: {sentence[:100]}...")
+            return self._no_evidence_result()
+
+        cached, cache_evidence, sentence_vec = await self._cache_lookup(
+            sentence, project_id, merged, context, query_vec
+        )
+        if cached is not None:
+            logger.info(f"Verified sentence (cached): {cached['validation_result']}")
+            return cached
+
+        # Format evidence for the prompt
+        evidence_text = self._format_evidence(merged)
+
+        # Create prompt using new SDK
+        human_prompt = self.verification_template.format(
+            claim=sentence,
+            context=context or "No additional context provided.",
+            evidence=evidence_text
+        )
+
+        # Call Gemini using new SDK
+        response_text = await self._generate(human_prompt)
+        result = self._parse_verification_response(response_text, merged)
+
+        if cache_evidence is not None:
+            semantic_cache.set(project_id, self.model, sentence, cache_evidence, result, sentence_vec)
+
+        logger.info(f"Verified sentence: {result['validation_result']}")
+        return result
+
+    async def _verify_group(
+        self,
+        sentences: List[str],
+        project_id: UUID,
+        merged: List[Dict],
+        context: str = "",
+        query_vecs: Optional[List[Optional[np.ndarray]]] = None
+    ) -> List[Dict]:
+        """
+        Verify several claims that share the same evidence in one Gemini call.
+
+        Claims found in the semantic cache are answered from it; if the
+        multi-claim response can't be matched back to every claim, the
+        remaining claims fall back to individual verification.
+
+        Args:
+            sentences: Claims sharing one evidence set
+            project_id: Project UUID
+            merged: Shared evidence chunks
+            context: Background context for the project
+            query_vecs: Sentence embeddings from retrieval, in the order of `sentences`
+
+        Returns:
+            Verification results in the order of `sentences`
+        """
+        if query_vecs is None:
+            query_vecs = [None] * len(sentences)
+        results: List[Optional[Dict]] = [None] * len(sentences)
+        pending = []
+        for idx, sentence in enumerate(sentences):
+            cached, cache_evidence, sentence_vec = await self._cache_lookup(
+                sentence, project_id, merged, context, query_vecs[idx]
             )
+            if cached is not None:
+                results[idx] = cached
+            else:
+                pending.append((idx, cache_evidence, sentence_vec))
 
-            # Call Gemini using new SDK
-            response = await self.client.aio.models.generate_content(
-                model=self.model,
-                contents=human_prompt,
-                config=types.GenerateContentConfig(
-                    system_instruction=self.system_prompt,
-                    temperature=settings.GEMINI_TEMPERATURE,
-                    max_output_tokens=settings.GEMINI_MAX_TOKENS,
-                    response_mime_type='application/json',
+        if len(pending) > 1:
+            prompt = self.batch_verification_template.format(
+                claims=json.dumps(
+                    [{"claim_index": n, "claim": sentences[idx]} for n, (idx, _, _) in enumerate(pending)],
+                    ensure_ascii=False
                 ),
+                context=context or "No additional context provided.",
+                evidence=self._format_evidence(merged)
             )
-            result = self._parse_verification_response(response.text, merged)
+            try:
+                parsed = orjson.loads(await self._generate(prompt))
+                by_index = {
+                    item.get("claim_index"): item
+                    for item in (parsed if isinstance(parsed, list) else [])
+                    if isinstance(item, dict)
+                }
+                for n, (idx, cache_evidence, sentence_vec) in enumerate(pending):
+                    if n not in by_index:
+                        continue
+                    result = self._build_result(by_index[n], merged)
+                    results[idx] = result
+                    if cache_evidence is not None:
+                        semantic_cache.set(project_id, self.model, sentences[idx], cache_evidence, result, sentence_vec)
+                logger.info(f"Verified {len(by_index)} claims in one call sharing {len(merged)} evidence chunks")
+            except Exception as e:
+                logger.warning(f"Grouped verification failed, verifying claims individually: {e}")
+
+        for idx, sentence in enumerate(sentences):
+            if results[idx] is None:
+                try:
+                    results[idx] = await self._verify_with_evidence(
+                        sentence, project_id, merged, context, query_vecs[idx]
+                    )
+                except Exception as e:
+                    logger.error(f"Error verifying sentence: {e}")
+                    results[idx] = self._error_result(e)
 
-            logger.info(f"Verified sentence: {result['validation_result']}")
-            return result
+        return results
 
-        except Exception as e:
-            logger.error(f"Error verifying sentence: {e}")
-            return {
-                "validation_result": ValidationResult.UNCERTAIN,
-                "confidence_score": 0.0,
-                "reasoning": f"Error during verification: {str(e)}",
-                "citations": []
-            }
+    @staticmethod
+    def _no_evidence_result() -> Dict:
+        return {
+            "validation_result": ValidationResult.UNCERTAIN,
+            "confidence_score": 0.0,
+            "reasoning": "No supporting evidence found in the provided documents.",
+            "citations": []
+        }
+
+    @staticmethod
+    def _error_result(error: Exception) -> Dict:
+        return {
+            "validation_result": ValidationResult.UNCERTAIN,
+            "confidence_score": 0.0,
+            "reasoning": f"Error during verification: {str(error)}",
+            "citations": []
+        }
 
     def _format_evidence(self, chunks: List[Dict]) -> str:
         """
@@ -180,19 +466,20 @@ Rules:
         Returns:
             Formatted evidence string
         """
-        evidence_parts = []
-
-        for idx, chunk in enumerate(chunks, 1):
-            evidence_parts.append(
-                f"# Evidence {idx}\n"
-                f"- similarity: {chunk['similarity']:.2f}\n"
-                f"- file: {chunk.get('filename','unknown')}\n"
-                f"- page: {chunk.get('page_number', 'N/A')}\n"
-                f"- chunk_id: {chunk.get('chunk_id','')}\n"
-                f"## content:\n{chunk['content']}\n"
+        tmpl = self._EVIDENCE_TMPL
+        max_chars = settings.MAX_EVIDENCE_CHARS
+
+        return "\n".join(
+            tmpl.format(
+                i=idx,
+                sim=chunk["similarity"],
+                fn=chunk.get("filename", "unknown"),
+                pg=chunk.get("page_number", "N/A"),
+                cid=chunk.get("chunk_id", ""),
+                content=chunk["content"][:max_chars]
             )
-
-        return "\n".join(evidence_parts)
+            for idx, chunk in enumerate(chunks, 1)
+        )
 
     def _parse_verification_response(self, response: str, chunks: List[Dict]) -> Dict:
         """
@@ -206,14 +493,14 @@ Rules:
             Structured verification result
         """
         try:
-            import json
-            import re
-
-            # Extract JSON from response
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                result = json.loads(json_match.group())
-            else:
+            # JSON mode returns a bare object; only scan for one if that fails
+            try:
+                result = orjson.loads(response)
+            except orjson.JSONDecodeError:
+                json_match = _JSON_RE.search(response)
+                result = orjson.loads(json_match.group()) if json_match else None
+
+            if not isinstance(result, dict):
                 # Fallback parsing
                 result = {
                     "validation_result": "UNCERTAIN",
@@ -222,48 +509,7 @@ Rules:
                     "citations": []
                 }
 
-            # Map validation result to enum
-            validation_map = {
-                "VALIDATED": ValidationResult.VALIDATED,
-                "UNCERTAIN": ValidationResult.UNCERTAIN,
-                "INCORRECT": ValidationResult.INCORRECT
-            }
-
-            validation_result = validation_map.get(
-                result.get("validation_result", "UNCERTAIN").upper(),
-                ValidationResult.UNCERTAIN
-            )
-
-            # Ensure confidence score is in range
-            confidence = float(result.get("confidence_score", 0.5))
-            confidence = max(0.0, min(1.0, confidence))
-
-            # Process citations
-            citations = []
-            for citation in result.get("citations", []):
-                # Try to match citation to original chunks
-                matching_chunk = self._find_matching_chunk(citation, chunks)
-
-                if matching_chunk:
-                    citations.append({
-                        "document_id": matching_chunk["document_id"],
-                        "cited_text": citation.get("quote", matching_chunk["content"][:200]),
-                        "page_number": matching_chunk.get("page_number"),
-                        "start_char": matching_chunk.get("start_char"),
-                        "end_char": matching_chunk.get("end_char"),
-                        "similarity_score": matching_chunk["similarity"],
-                        "context_before": "",
-                        "context_after": "",
-                        "filename": matching_chunk.get("filename", ""),
-                        "relevance": citation.get("relevance", "")
-                    })
-
-            return {
-                "validation_result": validation_result,
-                "confidence_score": confidence,
-                "reasoning": result.get("reasoning", ""),
-                "citations": citations
-            }
+            return self._build_result(result, chunks)
 
         except Exception as e:
             logger.error(f"Error parsing verification response: {e}")
@@ -274,62 +520,127 @@ Rules:
                 "citations": []
             }
 
-    async def _rerank_chunks(self, query: str, chunks: List[Dict]) -> List[Dict]:
+    def _build_result(self, result: Dict, chunks: List[Dict]) -> Dict:
+        """
+        Normalize a parsed LLM verdict and resolve its citations to evidence chunks.
+
+        Args:
+            result: Parsed JSON verdict for one claim
+            chunks: Evidence chunks shown to the model
+
+        Returns:
+            Structured verification result
+        """
+        # Map validation result to enum
+        validation_map = {
+            "VALIDATED": ValidationResult.VALIDATED,
+            "UNCERTAIN": ValidationResult.UNCERTAIN,
+            "INCORRECT": ValidationResult.INCORRECT
+        }
+
+        validation_result = validation_map.get(
+            result.get("validation_result", "UNCERTAIN").upper(),
+            ValidationResult.UNCERTAIN
+        )
+
+        # Ensure confidence score is in range
+        confidence = float(result.get("confidence_score", 0.5))
+        confidence = max(0.0, min(1.0, confidence))
+
+        # Process citations
+        citations = []
+        for citation in result.get("citations", []):
+            # Try to match citation to original chunks
+            matching_chunk = self._find_matching_chunk(citation, chunks)
+
+            if matching_chunk:
+                citations.append({
+                    "document_id": matching_chunk["document_id"],
+                    "cited_text": citation.get("quote", matching_chunk["content"][:200]),
+                    "page_number": matching_chunk.get("page_number"),
+                    "start_char": matching_chunk.get("start_char"),
+                    "end_char": matching_chunk.get("end_char"),
+                    "similarity_score": matching_chunk["similarity"],
+                    "context_before": "",
+                    "context_after": "",
+                    "filename": matching_chunk.get("filename", ""),
+                    "relevance": citation.get("relevance", "")
+                })
+
+        return {
+            "validation_result": validation_result,
+            "confidence_score": confidence,
+            "reasoning": result.get("reasoning", ""),
+            "citations": citations
+        }
+
+    async def _rerank_chunks(
+        self,
+        query: str,
+        chunks: List[Dict],
+        query_vec: Optional[np.ndarray] = None,
+        top_k: Optional[int] = None
+    ) -> List[Dict]:
         """
-        Rerank candidates. Prefer Cohere Rerank if configured; fallback to embedding cosine.
+        Rerank candidates. Prefer Cohere Rerank if configured, then a local
+        cross-encoder if enabled; fallback to embedding cosine, reusing
+        `query_vec` from retrieval when given. Only the best `top_k`
+        (default RERANK_CANDIDATES) are returned.
         """
+        # Deduplicate before scoring so rerankers never score the same chunk twice
+        chunks = _dedup_chunks(chunks)
         if not chunks:
             return []
 
         try:
             # Cohere rerank path (v2 API)
-            if settings.COHERE_API_KEY and cohere:
-                client = ClientV2(api_key=settings.COHERE_API_KEY)
+            if (client := _get_cohere()) is not None:
                 docs = [c["content"] for c in chunks]
-                rerank_res = client.rerank(
+                # Sync client; run off the loop so other in-flight batches keep going
+                rerank_res = await asyncio.to_thread(
+                    client.rerank,
                     model=settings.COHERE_RERANK_MODEL or "rerank-v3.5",
                     query=query,
                     documents=docs,
-                    top_n=min(len(chunks), settings.RERANK_CANDIDATES),
+                    top_n=min(len(chunks), top_k or settings.RERANK_CANDIDATES),
                 )
                 ranked = []
                 for r in rerank_res.results:
                     chunk = chunks[r.index]
                     chunk["similarity"] = max(chunk.get("similarity", 0), r.relevance_score)
                     ranked.append(chunk)
+            elif (cross_encoder := _get_cross_encoder()) is not None:
+                # Local cross-encoder scores (query, chunk) pairs jointly
+                scores = await asyncio.to_thread(
+                    cross_encoder.predict,
+                    [(query, c["content"]) for c in chunks],
+                    batch_size=settings.RERANK_BATCH_SIZE
+                )
+                # ms-marco cross-encoders emit logits; squash to 0-1 like Cohere relevance
+                relevance = 1.0 / (1.0 + np.exp(-np.asarray(scores, dtype=np.float32)))
+
+                for chunk, rel in zip(chunks, relevance.tolist()):
+                    chunk["_bi_score"] = chunk.get("similarity", 0)
+                    chunk["similarity"] = max(chunk["_bi_score"], rel)
+
+                ranked = [chunks[i] for i in _top_k_indices(relevance, top_k)]
             else:
                 # Fallback: embedding cosine
-                query_vec = await embedding_service.embed_text(query)
+                if query_vec is None:
+                    query_vec = await embedding_service.embed_text(query)
                 texts = [c["content"] for c in chunks]
                 chunk_vecs = await embedding_service.embed_batch(texts)
 
-                def cosine(a, b):
-                    import math
-                    dot = sum(x*y for x, y in zip(a, b))
-                    na = math.sqrt(sum(x*x for x in a))
-                    nb = math.sqrt(sum(x*x for x in b))
-                    return dot / (na * nb + 1e-12)
+                Q = np.asarray(query_vec, dtype=np.float32)
+                M = np.asarray(chunk_vecs, dtype=np.float32)
+                sims = (M @ Q) / (np.linalg.norm(M, axis=1) * np.linalg.norm(Q) + 1e-12)
 
-                scored = []
-                for chunk, vec in zip(chunks, chunk_vecs):
-                    sim = cosine(query_vec, vec)
+                for chunk, sim in zip(chunks, sims.tolist()):
                     chunk["similarity"] = max(chunk.get("similarity", 0), sim)
-                    scored.append((sim, chunk, vec))
-
-                scored.sort(key=lambda t: t[0], reverse=True)
-                ranked = [c for _, c, _ in scored]
-
-            # Deduplicate near-duplicates (>0.97) by content
-            deduped = []
-            seen = set()
-            for c in ranked:
-                key = hash(c["content"])
-                if key in seen:
-                    continue
-                seen.add(key)
-                deduped.append(c)
-
-            return deduped
+
+                ranked = [chunks[i] for i in _top_k_indices(sims, top_k)]
+
+            return ranked
         except Exception as e:
             logger.error(f"Rerank failed: {e}")
             return chunks
@@ -366,6 +677,12 @@ Rules:
         """
         Verify multiple sentences in batch.
 
+        All sentences are embedded in one batched request, then retrieval
+        runs concurrently for each; sentences whose reranked evidence is
+        identical are verified together in a single Gemini call. Retrieval and
+        Gemini calls share one GEMINI_CONCURRENCY limit across all concurrent
+        verify_batch calls on the event loop.
+
         Args:
             sentences: List of sentences to verify
             project_id: Project UUID
@@ -374,15 +691,65 @@ Rules:
         Returns:
             List of verification results
         """
-        results = []
+        semaphore = _get_gemini_semaphore()
+        results: List[Optional[Dict]] = [None] * len(sentences)
 
-        for sentence in sentences:
-            result = await self.verify_sentence(
-                sentence=sentence,
-                project_id=project_id,
-                context=context
-            )
-            results.append(result)
+        # One embeddings request for the whole batch; on failure each sentence embeds its own
+        try:
+            vectors = list(await embedding_service.embed_batch(sentences))
+        except Exception as e:
+            logger.warning(f"Batch embedding failed, embedding sentences individually: {e}")
+            vectors = [None] * len(sentences)
+
+        async def _retrieve(sentence: str, query_vec: Optional[np.ndarray]) -> Optional[List[Dict]]:
+            async with semaphore:
+                try:
+                    return await self._retrieve_evidence(sentence, project_id, query_vec=query_vec)
+                except Exception as e:
+                    logger.error(f"Error retrieving evidence: {e}")
+                    return None
+
+        evidence = await asyncio.gather(*[
+            _retrieve(sentence, query_vec) for sentence, query_vec in zip(sentences, vectors)
+        ])
+
+        # Group sentences by their exact evidence set
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for idx, merged in enumerate(evidence):
+            if merged is None:
+                results[idx] = self._error_result(RuntimeError("evidence retrieval failed"))
+            elif not merged:
+                results[idx] = self._no_evidence_result()
+            else:
+                key = tuple(sorted(str(_chunk_key(c)) for c in merged))
+                groups.setdefault(key, []).append(idx)
+
+        async def _verify(indices: List[int]):
+            merged = evidence[indices[0]]
+            async with semaphore:
+                if len(indices) == 1:
+                    try:
+                        group_results = [
+                            await self._verify_with_evidence(
+                                sentences[indices[0]], project_id, merged, context, vectors[indices[0]]
+                            )
+                        ]
+                    except Exception as e:
+                        logger.error(f"Error verifying sentence: {e}")
+                        group_results = [self._error_result(e)]
+                else:
+                    group_results = await self._verify_group(
+                        [sentences[i] for i in indices], project_id, merged, context,
+                        [vectors[i] for i in indices]
+                    )
+            for i, result in zip(indices, group_results):
+                results[i] = result
+
+        await asyncio.gather(*[
+            _verify(indices[start:start + _MAX_CLAIMS_PER_CALL])
+            for indices in groups.values()
+            for start in range(0, len(indices), _MAX_CLAIMS_PER_CALL)
+        ])
 
         return results
 
@@ -13,7 +13,7 @@ from loguru import logger
 
 from app.core.config import settings
 from app.services.vector_store import vector_store
-from app.services.mistral_service import mistral_service
+from app.services.mistral_service import get_mistral_service
 from app.db.models import ValidationResult
 
 
@@ -60,7 +60,7 @@ class MistralVerificationService:
                 }
 
             # Use Mistral for verification with precise citation tracking
-            verification_result = await mistral_service.verify_claim_with_citations(
+            verification_result = await get_mistral_service().verify_claim_with_citations(
                 claim=sentence,
                 claim_page=sentence_page,
                 supporting_evidence=similar_chunks,
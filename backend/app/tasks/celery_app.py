@@ -1,8 +1,12 @@
 """Celery application configuration."""
 
 from celery import Celery
-from celery.signals import worker_ready, worker_shutdown
+from celery.signals import worker_ready, worker_shutdown, worker_process_init, worker_process_shutdown
 from loguru import logger
+from typing import Any, Coroutine, Optional
+import asyncio
+import os
+import threading
 
 from app.core.config import settings
 
@@ -47,7 +51,82 @@ def on_worker_ready(**kwargs):
     logger.info("Celery worker is ready")
 
 
+# Persistent event loop per worker process; async clients (DB engine, Redis,
+# OpenAI/Gemini HTTP pools) stay bound to it across tasks instead of being
+# rebuilt by a fresh asyncio.run() loop every time
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_pid: Optional[int] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return this process's background event loop, starting it on first use."""
+    global _loop, _loop_pid
+    pid = os.getpid()
+    if _loop is None or _loop_pid != pid:
+        with _loop_lock:
+            # Threads don't survive fork, so a child never reuses the parent's loop
+            if _loop is None or _loop_pid != pid:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="celery-async-loop", daemon=True).start()
+                _loop, _loop_pid = loop, pid
+    return _loop
+
+
+def run_async(coro: Coroutine) -> Any:
+    """
+    Run a coroutine on the worker's persistent event loop and wait for its result.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _get_loop())
+    try:
+        return future.result()
+    except BaseException:
+        # e.g. SoftTimeLimitExceeded raised in the task thread: stop the coroutine too
+        future.cancel()
+        raise
+
+
+def _stop_loop():
+    """Stop this process's background event loop, if running."""
+    global _loop
+    if _loop is not None and _loop_pid == os.getpid():
+        _loop.call_soon_threadsafe(_loop.stop)
+        _loop = None
+
+
+def _dispose_task_engine():
+    """Dispose this process's cached task database engine, if any."""
+    from app.db.session import dispose_task_engines
+
+    try:
+        run_async(dispose_task_engines())
+    except Exception as e:
+        logger.warning(f"Failed to dispose task engine: {e}")
+
+
+@worker_process_init.connect
+def on_worker_process_init(**kwargs):
+    """Start the worker process's event loop."""
+    _get_loop()
+
+
 @worker_shutdown.connect
 def on_worker_shutdown(**kwargs):
     """Execute when worker is shutting down."""
     logger.info("Celery worker is shutting down")
+    # Solo/thread pools run tasks in the main process, so its engine is disposed here
+    _dispose_task_engine()
+    _stop_loop()
+
+
+@worker_process_shutdown.connect
+def on_worker_process_shutdown(**kwargs):
+    """Dispose the per-process task database engine."""
+    _dispose_task_engine()
+    _stop_loop()
@@ -1,16 +1,16 @@
 """Celery tasks for document processing and indexing."""
 
+from typing import List
 from uuid import UUID, uuid4
 from loguru import logger
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, insert
 from sqlalchemy.exc import DBAPIError
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.pool import NullPool
 import asyncio
-from contextlib import asynccontextmanager
+from celery import group
 
-from app.tasks.celery_app import celery_app
+from app.tasks.celery_app import celery_app, run_async
 from app.core.config import settings
+from app.db.session import get_task_session
 from app.services.document_processor import DocumentProcessor
 from app.services.vector_store import vector_store
 from app.db.models import Document, DocumentChunk, Project
@@ -22,63 +22,6 @@ class DocumentAlreadyProcessingError(Exception):
     pass
 
 
-@asynccontextmanager
-async def get_task_session():
-    """
-    Create a fresh async database session for Celery tasks.
-    
-    This creates a NEW engine and session per task to avoid event loop conflicts
-    when using Celery with asyncio. The engine is disposed after the task completes.
-    
-    Why this is needed:
-    - Celery uses fork-based multiprocessing (prefork worker pool)
-    - The global engine is created in the parent process with its own event loop
-    - When asyncio.run() creates a new loop in the worker, the pooled connections
-      are attached to the old/different loop, causing "attached to a different loop" errors
-    
-    PgBouncer compatibility:
-    - Uses NullPool since pgbouncer handles connection pooling
-    - Disables prepared statements (statement_cache_size=0) which pgbouncer
-      in transaction mode doesn't support
-    """
-    database_url = settings.DATABASE_URL.replace('postgresql://', 'postgresql+asyncpg://')
-    
-    engine = create_async_engine(
-        database_url,
-        echo=settings.DEBUG,
-        poolclass=NullPool,
-        connect_args={
-            "statement_cache_size": 0,
-            "prepared_statement_cache_size": 0,
-            # Generate unique prepared statement names to avoid collisions in pgbouncer
-            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
-        },
-        # Also disable SQLAlchemy-side prepared statement caching
-        execution_options={"prepared_statement_cache_size": 0},
-    )
-    
-    # Create session factory bound to this engine
-    session_factory = async_sessionmaker(
-        engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-        autocommit=False,
-        autoflush=False,
-    )
-    
-    async with session_factory() as session:
-        try:
-            yield session
-        except Exception as e:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
-    
-
-    await engine.dispose()
-
-
 @celery_app.task(
     bind=True,
     name='index_document',
@@ -105,7 +48,7 @@ def index_document_task(self, document_id: str, project_id: str):
         logger.info(f"[index:{self.request.id}] Starting indexing for document {document_id} (attempt {self.request.retries + 1})")
 
         # Run async task
-        result = asyncio.run(
+        result = run_async(
             _index_document_async(
                 UUID(document_id),
                 UUID(project_id),
@@ -142,6 +85,22 @@ async def _index_document_async(
     """
     async with get_task_session() as session:
         try:
+            # Cheap unlocked check first so re-triggers of indexed docs never take the row lock
+            indexed = (await session.execute(
+                select(Document.indexed).where(Document.id == document_id)
+            )).scalar_one_or_none()
+
+            if indexed is None:
+                raise ValueError(f"Document {document_id} not found")
+
+            if indexed:
+                logger.info(f"[index:{task_id}] Document {document_id} already indexed, skipping")
+                return {
+                    "document_id": str(document_id),
+                    "chunks_indexed": 0,
+                    "status": "already_indexed"
+                }
+
             # Lock the document row to avoid concurrent indexing of the same doc
             # Using FOR UPDATE NOWAIT - fails immediately if row is locked
             try:
@@ -168,7 +127,7 @@ async def _index_document_async(
             if not document:
                 raise ValueError(f"Document {document_id} not found")
 
-            # Idempotency check: skip if already indexed
+            # Re-check under the lock: another worker may have finished in between
             if document.indexed:
                 logger.info(f"[index:{task_id}] Document {document_id} already indexed, skipping")
                 return {
@@ -185,9 +144,9 @@ async def _index_document_async(
             await session.flush()
             logger.info(f"[index:{task_id}] Cleared existing chunks for {document_id}")
 
-            # Ensure Weaviate schema exists (sync operation, doesn't affect our transaction)
+            # Ensure Weaviate schema exists (off the event loop, doesn't affect our transaction)
             logger.info(f"[index:{task_id}] Creating schema for project {project_id}")
-            vector_store.create_schema(project_id)
+            await vector_store.acreate_schema(project_id)
 
             # Process document (file I/O, doesn't affect DB transaction)
             logger.info(f"[index:{task_id}] Processing file {document.file_path}")
@@ -199,49 +158,68 @@ async def _index_document_async(
             processed = await processor.process_document_for_indexing(document.file_path)
             logger.info(f"[index:{task_id}] Extracted {len(processed['chunks'])} chunks")
 
-            # Store chunks in database - use simple ORM approach for reliability
-            chunk_records = []
-            for idx, chunk in enumerate(processed["chunks"]):
-                chunk_record = DocumentChunk(
-                    document_id=document_id,
-                    chunk_index=idx,
-                    content=chunk["content"],
-                    page_number=chunk.get("page_number"),
-                    start_char=chunk.get("start_char"),
-                    end_char=chunk.get("end_char"),
-                    metadata_=chunk.get("metadata", {})
-                )
-                chunk_records.append(chunk_record)
-                session.add(chunk_record)
-
-            # Flush to get auto-generated IDs without releasing the lock
-            await session.flush()
-            logger.info(f"[index:{task_id}] Stored {len(chunk_records)} chunks in database")
+            # Chunk ids are generated client-side and double as Weaviate object ids,
+            # so the DB insert and the embedding/upload can run concurrently
+            rows = [
+                {
+                    "id": uuid4(),
+                    "document_id": document_id,
+                    "chunk_index": idx,
+                    "content": chunk["content"],
+                    "page_number": chunk.get("page_number"),
+                    "start_char": chunk.get("start_char"),
+                    "end_char": chunk.get("end_char"),
+                    "metadata_": chunk.get("metadata", {})
+                }
+                for idx, chunk in enumerate(processed["chunks"])
+            ]
+            for row in rows:
+                row["weaviate_id"] = str(row["id"])
 
-            # Build Weaviate payload from chunk records (already have IDs after flush)
             chunks_for_indexing = [
                 {
-                    "id": str(chunk.id),
-                    "content": chunk.content,
-                    "page_number": chunk.page_number,
-                    "start_char": chunk.start_char,
-                    "end_char": chunk.end_char
+                    "id": row["weaviate_id"],
+                    "content": row["content"],
+                    "page_number": row["page_number"],
+                    "start_char": row["start_char"],
+                    "end_char": row["end_char"]
                 }
-                for chunk in chunk_records
+                for row in rows
             ]
 
-            logger.info(f"[index:{task_id}] Indexing {len(chunks_for_indexing)} chunks in Weaviate")
-            weaviate_ids = await vector_store.index_chunks(
-                project_id=project_id,
-                chunks=chunks_for_indexing,
-                document_id=document_id,
-                filename=document.original_filename,
-                document_type=document.document_type.value
-            )
+            async def _store_rows():
+                if rows:
+                    await session.execute(insert(DocumentChunk), rows)
+                logger.info(f"[index:{task_id}] Stored {len(rows)} chunks in database")
 
-            # Update chunk records with Weaviate IDs
-            for chunk_record, weaviate_id in zip(chunk_records, weaviate_ids):
-                chunk_record.weaviate_id = weaviate_id
+            logger.info(f"[index:{task_id}] Indexing {len(chunks_for_indexing)} chunks in Weaviate")
+            # TaskGroup cancels and awaits the other side if either fails, so the
+            # session's connection is idle again before the rollback below
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    tg.create_task(_store_rows())
+                    tg.create_task(vector_store.index_chunks(
+                        project_id=project_id,
+                        chunks=chunks_for_indexing,
+                        document_id=document_id,
+                        filename=document.original_filename,
+                        document_type=document.document_type.value
+                    ))
+            except Exception as e:
+                # Weaviate may already hold some or all of the new objects; they have
+                # no DB rows after the rollback and would resurface on re-indexing
+                try:
+                    await asyncio.to_thread(
+                        vector_store.delete_documents_chunks, project_id, [document_id]
+                    )
+                except Exception as cleanup_error:
+                    logger.error(
+                        f"[index:{task_id}] Failed to remove Weaviate chunks for {document_id}: {cleanup_error}"
+                    )
+                # Surface the failing step's own error rather than the group wrapper
+                if isinstance(e, ExceptionGroup):
+                    raise e.exceptions[0]
+                raise
 
             # Mark document as indexed
             document.indexed = True
@@ -254,7 +232,7 @@ async def _index_document_async(
 
             return {
                 "document_id": str(document_id),
-                "chunks_indexed": len(chunk_records),
+                "chunks_indexed": len(rows),
                 "status": "completed"
             }
 
@@ -269,62 +247,48 @@ def index_project_documents_task(self, project_id: str):
     """
     Index all documents in a project.
 
+    Each unindexed document is dispatched as its own index_document task in a
+    Celery group so they run across all available workers; the per-document
+    FOR UPDATE NOWAIT lock keeps overlapping runs safe.
+
     Args:
         project_id: Project UUID
     """
     try:
         logger.info(f"Starting project indexing for {project_id}")
-        result = asyncio.run(_index_project_documents_async(UUID(project_id)))
-        logger.info(f"Successfully indexed project {project_id}")
-        return result
+        document_ids = run_async(_unindexed_document_ids(UUID(project_id)))
+
+        job = group(index_document_task.s(str(doc_id), project_id) for doc_id in document_ids)
+        group_result = job.apply_async()
+        logger.info(f"Dispatched {len(document_ids)} indexing tasks for project {project_id}")
+
+        return {
+            "project_id": project_id,
+            "task_group_id": group_result.id,
+            "total_documents": len(document_ids),
+            "status": "dispatched"
+        }
 
     except Exception as e:
         logger.error(f"Error indexing project {project_id}: {e}")
         raise
 
 
-async def _index_project_documents_async(project_id: UUID):
+async def _unindexed_document_ids(project_id: UUID) -> List[UUID]:
     """
-    Async implementation of project document indexing.
-    
-    Note: Each document is indexed in its own session/transaction to avoid
-    holding locks across multiple documents.
+    Snapshot the IDs of a project's unindexed documents.
+
+    Args:
+        project_id: Project UUID
+
+    Returns:
+        List of document UUIDs
     """
     async with get_task_session() as session:
-        # Get all unindexed documents (snapshot of IDs)
         result = await session.execute(
             select(Document.id).where(
                 Document.project_id == project_id,
                 Document.indexed == False
             )
         )
-        document_ids = [row[0] for row in result.fetchall()]
-
-    # Index each document in its own session/transaction
-    indexed_count = 0
-    skipped_count = 0
-    failed_count = 0
-    
-    for doc_id in document_ids:
-        try:
-            result = await _index_document_async(
-                doc_id,
-                project_id,
-                f"project_index_{project_id}"
-            )
-            if result.get("status") == "completed":
-                indexed_count += 1
-            elif result.get("status") in ("already_indexed", "already_processing"):
-                skipped_count += 1
-        except Exception as e:
-            logger.error(f"Error indexing document {doc_id}: {e}")
-            failed_count += 1
-
-    return {
-        "project_id": str(project_id),
-        "documents_indexed": indexed_count,
-        "documents_skipped": skipped_count,
-        "documents_failed": failed_count,
-        "total_documents": len(document_ids),
-        "status": "completed"
-    }
+        return [row[0] for row in result.fetchall()]
@@ -0,0 +1,128 @@
+"""Redis progress events for verification jobs."""
+
+from typing import Awaitable, Callable, Dict, Optional
+from uuid import UUID
+from loguru import logger
+import asyncio
+import orjson
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.db.models import VerificationStatus
+
+
+# Shared Redis client for progress publishes; rebuilt when a task runs on a new event loop
+_redis_client: Optional[aioredis.Redis] = None
+_redis_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_redis() -> aioredis.Redis:
+    """Return the Redis client bound to the running event loop."""
+    global _redis_client, _redis_loop
+    loop = asyncio.get_running_loop()
+    if _redis_client is None or _redis_loop is not loop:
+        _redis_client = aioredis.Redis.from_url(settings.REDIS_URL, max_connections=16)
+        _redis_loop = loop
+    return _redis_client
+
+
+def progress_publisher(job_id: UUID) -> Callable[..., Awaitable[None]]:
+    """
+    Build a progress publisher bound to one job's Redis channel.
+
+    The channel name and job id string are formatted once per job rather
+    than on every publish.
+
+    Args:
+        job_id: Verification job UUID
+
+    Returns:
+        Coroutine function publish(status, progress, current_sentence, total_sentences)
+    """
+    job_key = str(job_id)
+    channel = f"verification_progress_{job_key}"
+
+    async def publish(
+        status: VerificationStatus,
+        progress: float,
+        current_sentence: int,
+        total_sentences: int
+    ):
+        try:
+            # Publish progress update to Redis channel
+            progress_data = {
+                "job_id": job_key,
+                "status": status.value,
+                "progress": progress,
+                "current_sentence": current_sentence,
+                "total_sentences": total_sentences,
+                "message": f"Verified {current_sentence} of {total_sentences} sentences"
+            }
+
+            await _get_redis().publish(channel, orjson.dumps(progress_data))
+
+            logger.debug(f"Published progress update for job {job_key}")
+
+        except Exception as e:
+            logger.error(f"Error sending progress update: {e}")
+
+    return publish
+
+
+class ProgressCoalescer:
+    """
+    Debounce one job's progress events to at most one publish per interval.
+
+    The verification loop only records the latest snapshot; a background task
+    publishes it whenever it has changed, so Redis and WebSocket clients see a
+    bounded event rate however many batches are in flight.
+    """
+
+    def __init__(self, publish: Callable[..., Awaitable[None]], interval: float = None):
+        """
+        Initialize the coalescer.
+
+        Args:
+            publish: Publisher from progress_publisher()
+            interval: Min seconds between publishes (default PROGRESS_PUBLISH_INTERVAL)
+        """
+        self._publish = publish
+        self._interval = settings.PROGRESS_PUBLISH_INTERVAL if interval is None else interval
+        self._latest: Dict = {}
+        self._dirty = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background publisher on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def update(self, **snapshot):
+        """Replace the pending snapshot (publish() keyword arguments)."""
+        self._latest = snapshot
+        self._dirty.set()
+
+    async def _run(self):
+        while True:
+            await self._dirty.wait()
+            self._dirty.clear()
+            await self._publish(**self._latest)
+            await asyncio.sleep(self._interval)
+
+    async def close(self, **final):
+        """
+        Stop the background publisher, dropping any unpublished snapshot.
+
+        Args:
+            **final: If given, published immediately as the last event
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if final:
+            await self._publish(**final)
+
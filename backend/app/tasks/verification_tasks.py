@@ -1,75 +1,31 @@
 """Celery tasks for document verification."""
 
+from collections import deque
+from typing import Deque, Dict, List, Tuple
 from uuid import UUID, uuid4
 from loguru import logger
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy import select, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
 import asyncio
+from itertools import islice
 from datetime import datetime
-from contextlib import asynccontextmanager
 
-from app.tasks.celery_app import celery_app
+from app.tasks.celery_app import celery_app, run_async
+from app.tasks.progress import ProgressCoalescer, progress_publisher
 from app.core.config import settings
+from app.db.session import get_task_session
 from app.services.document_processor import DocumentProcessor
 from app.services.verification_service import verification_service
 from app.db.models import (
-    VerificationJob, Document, Project, VerifiedSentence,
+    VerificationJob, Document, Project, VerifiedSentence, Citation,
     VerificationStatus, ValidationResult
 )
 
+# Enum members compared in the per-sentence loop
+_VALIDATED = ValidationResult.VALIDATED
+_UNCERTAIN = ValidationResult.UNCERTAIN
+_INCORRECT = ValidationResult.INCORRECT
 
-@asynccontextmanager
-async def get_task_session():
-    """
-    Create a fresh async database session for Celery tasks.
-    
-    This creates a NEW engine and session per task to avoid event loop conflicts
-    when using Celery with asyncio. The engine is disposed after the task completes.
-    
-    PgBouncer compatibility:
-    - Uses NullPool since pgbouncer handles connection pooling
-    - Disables prepared statements (statement_cache_size=0) which pgbouncer
-      in transaction mode doesn't support
-    """
-    database_url = settings.DATABASE_URL.replace('postgresql://', 'postgresql+asyncpg://')
-    
-    # Use NullPool - pgbouncer handles connection pooling, not SQLAlchemy
-    engine = create_async_engine(
-        database_url,
-        echo=settings.DEBUG,
-        poolclass=NullPool,
-        connect_args={
-            # Disable prepared statements for pgbouncer compatibility
-            "statement_cache_size": 0,
-            "prepared_statement_cache_size": 0,
-            # Generate unique prepared statement names to avoid collisions in pgbouncer
-            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
-        },
-        # Also disable SQLAlchemy-side prepared statement caching
-        execution_options={"prepared_statement_cache_size": 0},
-    )
-    
-    # Create session factory bound to this engine
-    session_factory = async_sessionmaker(
-        engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-        autocommit=False,
-        autoflush=False,
-    )
-    
-    async with session_factory() as session:
-        try:
-            yield session
-        except Exception as e:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
-    
-    # Dispose the engine to clean up connections
-    await engine.dispose()
 
 
 @celery_app.task(
@@ -89,7 +45,7 @@ def run_verification_task(self, verification_job_id: str):
         logger.info(f"[verify:{self.request.id}] Starting verification job {verification_job_id}")
 
         # Run async task
-        result = asyncio.run(
+        result = run_async(
             _run_verification_async(
                 UUID(verification_job_id),
                 self.request.id
@@ -104,7 +60,7 @@ def run_verification_task(self, verification_job_id: str):
 
         # Update job status to failed
         try:
-            asyncio.run(_update_job_status(
+            run_async(_update_job_status(
                 UUID(verification_job_id),
                 VerificationStatus.FAILED,
                 error_message=str(e)
@@ -114,44 +70,117 @@ def run_verification_task(self, verification_job_id: str):
         raise
 
 
+def _sentence_rows(user_id: UUID, job_id: UUID, sentence_data: Dict, verification_result: Dict):
+    """
+    Build the verified_sentences row and its citations rows for one result.
+
+    Plain dicts only, so nothing is added to the session's identity map.
+
+    Args:
+        user_id: Owner of the verification job
+        job_id: Verification job UUID
+        sentence_data: Extracted sentence with positions
+        verification_result: Result from the verification service
+
+    Returns:
+        Tuple of (sentence row, list of citation rows)
+    """
+    # Ids are generated here so citations can reference their sentence and the
+    # batched INSERT/COPY never needs RETURNING to learn primary keys
+    sentence_id = uuid4()
+    sentence_row = {
+        "id": sentence_id,
+        "user_id": user_id,
+        "verification_job_id": job_id,
+        "sentence_index": sentence_data["index"],
+        "content": sentence_data["content"],
+        "page_number": sentence_data.get("page_number"),
+        "start_char": sentence_data.get("start_char"),
+        "end_char": sentence_data.get("end_char"),
+        "validation_result": verification_result["validation_result"],
+        "confidence_score": verification_result.get("confidence_score"),
+        "reasoning": verification_result.get("reasoning"),
+    }
+
+    citation_rows = []
+    for rank, citation in enumerate(verification_result.get("citations", [])):
+        similarity = citation.get("similarity_score")
+        citation_rows.append({
+            "id": uuid4(),
+            "verified_sentence_id": sentence_id,
+            "source_document_id": citation.get("document_id"),
+            "cited_text": citation.get("cited_text") or "",
+            "page_number": citation.get("page_number"),
+            "start_char": citation.get("start_char"),
+            "end_char": citation.get("end_char"),
+            # DB check constraint expects similarity in 0–1 range
+            "similarity_score": None if similarity is None else max(0.0, min(1.0, float(similarity))),
+            "relevance_rank": rank,
+            "context_before": citation.get("context_before"),
+            "context_after": citation.get("context_after"),
+        })
+
+    return sentence_row, citation_rows
+
+
+async def _store_sentence_rows(
+    session: AsyncSession,
+    sentence_rows: List[Dict],
+    citation_rows: List[Dict]
+):
+    """
+    Write buffered sentence and citation rows inside the session's transaction.
+
+    Each table is one executemany INSERT, batched into multi-row statements
+    by the task engine's insertmanyvalues page size.
+
+    Args:
+        session: Task database session
+        sentence_rows: Rows for verified_sentences
+        citation_rows: Rows for citations (must reference sentence_rows ids)
+    """
+    if not sentence_rows:
+        return
+
+    await session.execute(insert(VerifiedSentence.__table__), sentence_rows)
+    if citation_rows:
+        await session.execute(insert(Citation.__table__), citation_rows)
+
+
 async def _run_verification_async(job_id: UUID, task_id: str):
     """
     Async implementation of verification job.
     
-    Processes sentences sequentially to avoid SQLAlchemy session conflicts,
-    with periodic commits to persist progress.
+    Verifies sentences in concurrently running batches while a single loop
+    persists results in order, with periodic commits to persist progress.
     """
     async with get_task_session() as session:
+        # Verification batches running ahead of the persistence loop
+        in_flight: Deque[Tuple[List[Dict], range, asyncio.Task]] = deque()
+        progress_events = ProgressCoalescer(progress_publisher(job_id))
         try:
-            # Get verification job
+            # Load the job with its main document and project in one round trip
             result = await session.execute(
-                select(VerificationJob).where(VerificationJob.id == job_id)
+                select(VerificationJob, Document, Project)
+                .outerjoin(Document, Document.id == VerificationJob.main_document_id)
+                .outerjoin(Project, Project.id == VerificationJob.project_id)
+                .where(VerificationJob.id == job_id)
             )
-            job = result.scalar_one_or_none()
+            row = result.one_or_none()
 
-            if not job:
+            if not row:
                 raise ValueError(f"Verification job {job_id} not found")
 
-            # Update status to processing
+            job, main_doc, project = row
+
+            # Mark as processing; committed together with the sentence total below
             job.status = VerificationStatus.PROCESSING
             job.started_at = datetime.utcnow()
             job.celery_task_id = task_id
-            await session.commit()
-
-            # Get main document
-            result = await session.execute(
-                select(Document).where(Document.id == job.main_document_id)
-            )
-            main_doc = result.scalar_one_or_none()
 
             if not main_doc:
                 raise ValueError(f"Main document {job.main_document_id} not found")
 
-            # Get project for context
-            result = await session.execute(
-                select(Project).where(Project.id == job.project_id)
-            )
-            project = result.scalar_one_or_none()
             project_context = project.background_context if project else ""
 
             # Process main document to extract sentences
@@ -160,98 +189,153 @@ async def _run_verification_async(job_id: UUID, task_id: str):
                 chunk_size=settings.CHUNK_SIZE,
                 chunk_overlap=settings.CHUNK_OVERLAP
             )
-            processed = await processor.process_document_for_verification(main_doc.file_path)
-            sentences = processed["sentences"]
+            # Sentences are built lazily; only their spans are held in memory
+            total_sentences, sentence_iter = await processor.iter_sentences_for_verification(main_doc.file_path)
 
-            # Update total count
-            job.total_sentences = len(sentences)
+            # Single start-of-job commit: status, start time, task id and total count
+            job.total_sentences = total_sentences
             await session.commit()
-            logger.info(f"[verify:{task_id}] Found {len(sentences)} sentences to verify")
+            logger.info(f"[verify:{task_id}] Found {total_sentences} sentences to verify")
+            # Progress is a multiply per checkpoint rather than a division
+            inv_total = 1.0 / total_sentences if total_sentences else 0.0
 
             # Counters
             validated_count = 0
             uncertain_count = 0
             incorrect_count = 0
             error_count = 0
+            verified_count = 0
             
             # Commit interval - commit every N sentences to persist progress
             commit_interval = getattr(settings, 'VERIFICATION_COMMIT_INTERVAL', 5)
 
-            # Process sentences sequentially to avoid session conflicts
-            for idx, sentence_data in enumerate(sentences):
+            progress_events.start()
+
+            # Read once from the ORM job rather than per row
+            job_user_id = job.user_id
+
+            # Rows buffered between commits and written in one batch
+            pending_sentences: List[Dict] = []
+            pending_citations: List[Dict] = []
+
+            # Verify in batches (shared embedding request, concurrent retrieval/LLM calls)
+            # with up to VERIFICATION_CONCURRENCY batches in flight; only this coroutine
+            # consumes results, in order, so the session is never used concurrently
+            batch_size = max(1, settings.VERIFICATION_BATCH_SIZE)
+            batch_start = 0
+
+            def _schedule_batch():
+                nonlocal batch_start
+                batch = list(islice(sentence_iter, batch_size))
+                if batch:
+                    batch_indices = range(batch_start, batch_start + len(batch))
+                    batch_start += len(batch)
+                    in_flight.append((batch, batch_indices, asyncio.create_task(
+                        verification_service.verify_batch(
+                            sentences=[sentence_data["content"] for sentence_data in batch],
+                            project_id=job.project_id,
+                            context=project_context
+                        )
+                    )))
+
+            for _ in range(max(1, settings.VERIFICATION_CONCURRENCY)):
+                _schedule_batch()
+
+            while in_flight:
+                batch, batch_indices, batch_task = in_flight.popleft()
                 try:
-                    verification_result = await verification_service.verify_sentence(
-                        sentence=sentence_data["content"],
-                        project_id=job.project_id,
-                        context=project_context
+                    batch_results = await batch_task
+                except Exception as e:
+                    batch_results = None
+                    error_count += len(batch)
+                    logger.error(
+                        f"[verify:{task_id}] Error verifying sentences "
+                        f"{batch[0]['index']}-{batch[-1]['index']}: {e}"
                     )
+                # Refill the window only once this batch has finished, so at most
+                # VERIFICATION_CONCURRENCY batches are ever running
+                _schedule_batch()
+                if batch_results is None:
+                    continue
 
-                    verified_sentence = VerifiedSentence(
-                        verification_job_id=job_id,
-                        sentence_index=sentence_data["index"],
-                        content=sentence_data["content"],
-                        page_number=sentence_data.get("page_number"),
-                        start_char=sentence_data.get("start_char"),
-                        end_char=sentence_data.get("end_char"),
-                        validation_result=verification_result["validation_result"],
-                        confidence_score=verification_result.get("confidence_score"),
-                        reasoning=verification_result.get("reasoning"),
-                        citations=verification_result.get("citations", [])
-                    )
+                for idx, sentence_data, verification_result in zip(batch_indices, batch, batch_results):
+                    try:
+                        sentence_row, citation_rows = _sentence_rows(
+                            job_user_id, job_id, sentence_data, verification_result
+                        )
+                        validation_result = verification_result["validation_result"]
+                    except Exception as e:
+                        error_count += 1
+                        logger.error(f"[verify:{task_id}] Error verifying sentence {sentence_data['index']}: {e}")
+                        # Continue with next sentence instead of failing entirely
+                        continue
 
-                    session.add(verified_sentence)
+                    pending_sentences.append(sentence_row)
+                    pending_citations.extend(citation_rows)
 
-                    if verification_result["validation_result"] == ValidationResult.VALIDATED:
+                    if validation_result is _VALIDATED:
                         validated_count += 1
-                    elif verification_result["validation_result"] == ValidationResult.UNCERTAIN:
+                    elif validation_result is _UNCERTAIN:
                         uncertain_count += 1
-                    elif verification_result["validation_result"] == ValidationResult.INCORRECT:
+                    elif validation_result is _INCORRECT:
                         incorrect_count += 1
 
-                    # Update job progress
-                    job.verified_sentences = idx + 1
-                    # progress is stored as 0–1 per DB constraint
-                    job.progress = (idx + 1) / job.total_sentences
-                    job.validated_count = validated_count
-                    job.uncertain_count = uncertain_count
-                    job.incorrect_count = incorrect_count
-
-                    # Commit periodically to persist progress
-                    if (idx + 1) % commit_interval == 0:
+                    verified_count = idx + 1
+
+                    # Persist rows and job progress only at checkpoints. Outside the
+                    # per-sentence try: a DB error fails the job right away instead of
+                    # leaving the transaction aborted while the rest is verified
+                    if verified_count % commit_interval == 0:
+                        await _store_sentence_rows(session, pending_sentences, pending_citations)
+                        pending_sentences.clear()
+                        pending_citations.clear()
+                        # progress is stored as 0–1 per DB constraint
+                        progress = verified_count * inv_total
+                        await session.execute(
+                            update(VerificationJob)
+                            .where(VerificationJob.id == job_id)
+                            .values(
+                                verified_sentences=verified_count,
+                                progress=progress,
+                                validated_count=validated_count,
+                                uncertain_count=uncertain_count,
+                                incorrect_count=incorrect_count
+                            )
+                        )
                         await session.commit()
-                        
-                        # Send progress update
-                        await send_verification_progress(
-                            job_id=job_id,
+
+                        # Record progress; published at most once per PROGRESS_PUBLISH_INTERVAL
+                        progress_events.update(
                             status=VerificationStatus.PROCESSING,
-                            progress=job.progress,
-                            current_sentence=job.verified_sentences,
-                            total_sentences=job.total_sentences
+                            progress=progress,
+                            current_sentence=verified_count,
+                            total_sentences=total_sentences
                         )
-                        
+
                         logger.info(
-                            f"[verify:{task_id}] Progress: {idx + 1}/{len(sentences)} "
+                            f"[verify:{task_id}] Progress: {idx + 1}/{total_sentences} "
                             f"(V:{validated_count} U:{uncertain_count} I:{incorrect_count})"
                         )
 
-                except Exception as e:
-                    error_count += 1
-                    logger.error(f"[verify:{task_id}] Error verifying sentence {sentence_data['index']}: {e}")
-                    # Continue with next sentence instead of failing entirely
-                    continue
-
-            # Final commit for any remaining uncommitted changes
-            await session.commit()
-
-            # Mark job as completed
-            job.status = VerificationStatus.COMPLETED
-            job.completed_at = datetime.utcnow()
-            job.progress = 1.0
+            # Write remaining rows and mark job as completed with the final counts
+            await _store_sentence_rows(session, pending_sentences, pending_citations)
+            await session.execute(
+                update(VerificationJob)
+                .where(VerificationJob.id == job_id)
+                .values(
+                    status=VerificationStatus.COMPLETED,
+                    completed_at=datetime.utcnow(),
+                    progress=1.0,
+                    verified_sentences=verified_count,
+                    validated_count=validated_count,
+                    uncertain_count=uncertain_count,
+                    incorrect_count=incorrect_count
+                )
+            )
             await session.commit()
 
-            # Send completion update
-            await send_verification_progress(
-                job_id=job_id,
+            # Stop debounced updates and send completion update
+            await progress_events.close(
                 status=VerificationStatus.COMPLETED,
                 progress=100.0,
                 current_sentence=job.total_sentences,
@@ -273,7 +357,10 @@ async def _run_verification_async(job_id: UUID, task_id: str):
                 "errors": error_count
             }
 
-        except Exception as e:
+        except BaseException as e:
+            for _, _, batch_task in in_flight:
+                batch_task.cancel()
+            await progress_events.close()
             await session.rollback()
             logger.exception(f"[verify:{task_id}] Error in async verification: {e}")
             raise
@@ -284,60 +371,19 @@ async def _update_job_status(
     status: VerificationStatus,
     error_message: str = None
 ):
-    """Update verification job status."""
-    async with get_task_session() as session:
-        result = await session.execute(
-            select(VerificationJob).where(VerificationJob.id == job_id)
-        )
-        job = result.scalar_one_or_none()
-
-        if job:
-            job.status = status
-            if error_message:
-                job.error_message = error_message
-            if status == VerificationStatus.COMPLETED:
-                job.completed_at = datetime.utcnow()
-                # DB check constraint expects progress in 0–1 range
-                job.progress = 1.0
-
-            await session.commit()
-
-
-async def send_verification_progress(
-    job_id: UUID,
-    status: VerificationStatus,
-    progress: float,
-    current_sentence: int,
-    total_sentences: int
-):
-    """
-    Send verification progress update via WebSocket.
+    """Update verification job status with a single UPDATE statement."""
+    values = {"status": status}
+    if error_message:
+        values["error_message"] = error_message
+    if status == VerificationStatus.COMPLETED:
+        values["completed_at"] = datetime.utcnow()
+        # DB check constraint expects progress in 0–1 range
+        values["progress"] = 1.0
 
-    This would normally use the Socket.IO instance from main.py,
-    but for Celery tasks we can use Redis pub/sub or HTTP callback.
-    """
-    try:
-        import redis
-        from app.core.config import settings
-
-        redis_client = redis.from_url(settings.REDIS_URL)
-
-        # Publish progress update to Redis channel
-        progress_data = {
-            "job_id": str(job_id),
-            "status": status.value,
-            "progress": progress,
-            "current_sentence": current_sentence,
-            "total_sentences": total_sentences,
-            "message": f"Verified {current_sentence} of {total_sentences} sentences"
-        }
-
-        redis_client.publish(
-            f"verification_progress_{job_id}",
-            str(progress_data)
+    async with get_task_session() as session:
+        await session.execute(
+            update(VerificationJob)
+            .where(VerificationJob.id == job_id)
+            .values(**values)
         )
-
-        logger.debug(f"Published progress update for job {job_id}")
-
-    except Exception as e:
-        logger.error(f"Error sending progress update: {e}")
+        await session.commit()
@@ -19,8 +19,8 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from loguru import logger
 from app.core.config import settings
-from app.services.storage_service import storage_service
-from app.services.mistral_service import mistral_service
+from app.services.storage_service import get_storage_service
+from app.services.mistral_service import get_mistral_service
 
 
 async def test_mistral_connection():
@@ -59,7 +59,7 @@ async def test_mistral_connection():
         Net Income: $150 million
         """
 
-        result = await mistral_service.extract_structured_content(
+        result = await get_mistral_service().extract_structured_content(
             page_text=test_text,
             page_number=1,
             document_metadata={"title": "Test IPO Document"}
@@ -105,7 +105,7 @@ async def test_s3_connection():
 
         # Test bucket connection
         logger.info("\nTesting S3 bucket connection...")
-        storage_service.s3_client.head_bucket(Bucket=settings.S3_BUCKET)
+        await asyncio.to_thread(get_storage_service().s3_client.head_bucket, Bucket=settings.S3_BUCKET)
         logger.info(f"✓ Successfully connected to S3 bucket: {settings.S3_BUCKET}")
 
         return True
@@ -135,16 +135,21 @@ async def main():
     logger.info("IPO Verification System - Configuration Test")
     logger.info("=" * 60)
 
-    results = []
-
-    # Test Mistral API
-    results.append(("Mistral API", await test_mistral_connection()))
+    # The probes are independent, so run them concurrently
+    names = ["Mistral API", "S3 Storage", "Mistral OCR"]
+    outcomes = await asyncio.gather(
+        test_mistral_connection(),
+        test_s3_connection(),
+        test_mistral_ocr(),  # optional
+        return_exceptions=True
+    )
 
-    # Test S3 Storage
-    results.append(("S3 Storage", await test_s3_connection()))
-
-    # Test Mistral OCR (optional)
-    results.append(("Mistral OCR", await test_mistral_ocr()))
+    results = []
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"❌ {name} test raised: {outcome}")
+            outcome = False
+        results.append((name, outcome))
 
     # Summary
     logger.info("\n" + "=" * 60)
@@ -0,0 +1,52 @@
+"""Tests for the process-local embedding cache."""
+
+import numpy as np
+import pytest
+
+from app.services.embedding_cache import EmbeddingCache
+
+MODEL = "text-embedding-test"
+
+
+def test_misses_return_none_in_input_order():
+    cache = EmbeddingCache(maxsize=8)
+    cache.set_many(["b"], MODEL, [[2.0, 2.0]])
+
+    hits = cache.get_many(["a", "b", "c"], MODEL)
+
+    assert hits[0] is None and hits[2] is None
+    np.testing.assert_array_equal(hits[1], [2.0, 2.0])
+
+
+def test_stored_vectors_are_float32_readonly_copies():
+    cache = EmbeddingCache(maxsize=8)
+    source = np.array([1.0, 2.0, 3.0], dtype=np.float64)
+    cache.set_many(["text"], MODEL, [source])
+    source[0] = 99.0
+
+    (cached,) = cache.get_many(["text"], MODEL)
+
+    assert cached.dtype == np.float32
+    np.testing.assert_array_equal(cached, [1.0, 2.0, 3.0])
+    with pytest.raises(ValueError):
+        cached[0] = 0.0
+
+
+def test_model_is_part_of_the_key():
+    cache = EmbeddingCache(maxsize=8)
+    cache.set_many(["text"], MODEL, [[1.0]])
+
+    assert cache.get_many(["text"], "other-model") == [None]
+    assert EmbeddingCache.key("text", MODEL) != EmbeddingCache.key("text", "other-model")
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = EmbeddingCache(maxsize=2)
+    cache.set_many(["a", "b"], MODEL, [[1.0], [2.0]])
+    cache.get_many(["a"], MODEL)  # touch "a" so "b" is least recent
+
+    cache.set_many(["c"], MODEL, [[3.0]])
+    a, b, c = cache.get_many(["a", "b", "c"], MODEL)
+
+    assert b is None
+    assert a is not None and c is not None
@@ -0,0 +1,81 @@
+"""Tests for debounced verification progress events."""
+
+import asyncio
+
+from app.tasks.progress import ProgressCoalescer
+
+INTERVAL = 0.2
+
+
+class RecordingPublisher:
+    """Stand-in for progress_publisher() that records each event."""
+
+    def __init__(self):
+        self.events = []
+
+    async def __call__(self, **event):
+        self.events.append(event)
+
+
+async def test_nothing_is_published_without_updates():
+    publish = RecordingPublisher()
+    coalescer = ProgressCoalescer(publish, interval=INTERVAL)
+    coalescer.start()
+
+    await asyncio.sleep(0.05)
+    await coalescer.close()
+
+    assert publish.events == []
+
+
+async def test_updates_within_an_interval_are_coalesced_to_the_latest():
+    publish = RecordingPublisher()
+    coalescer = ProgressCoalescer(publish, interval=INTERVAL)
+    coalescer.start()
+
+    for n in (1, 2, 3):
+        coalescer.update(current_sentence=n)
+    await asyncio.sleep(0.05)
+    assert publish.events == [{"current_sentence": 3}]
+
+    # Still inside the interval after the first publish: held back
+    coalescer.update(current_sentence=4)
+    coalescer.update(current_sentence=5)
+    await asyncio.sleep(0.05)
+    assert publish.events == [{"current_sentence": 3}]
+
+    await asyncio.sleep(INTERVAL)
+    assert publish.events == [{"current_sentence": 3}, {"current_sentence": 5}]
+
+    await coalescer.close()
+
+
+async def test_close_publishes_final_event_immediately_and_drops_pending():
+    publish = RecordingPublisher()
+    coalescer = ProgressCoalescer(publish, interval=INTERVAL)
+    coalescer.start()
+    coalescer.update(current_sentence=1)
+    await asyncio.sleep(0.05)
+
+    coalescer.update(current_sentence=2)
+    await coalescer.close(current_sentence=10, status="completed")
+    await asyncio.sleep(INTERVAL + 0.05)
+
+    assert publish.events == [
+        {"current_sentence": 1},
+        {"current_sentence": 10, "status": "completed"},
+    ]
+
+
+async def test_close_without_final_event_publishes_nothing_more():
+    publish = RecordingPublisher()
+    coalescer = ProgressCoalescer(publish, interval=INTERVAL)
+    coalescer.start()
+    coalescer.update(current_sentence=1)
+    await asyncio.sleep(0.05)
+
+    coalescer.update(current_sentence=2)
+    await coalescer.close()
+    await asyncio.sleep(INTERVAL + 0.05)
+
+    assert publish.events == [{"current_sentence": 1}]
@@ -0,0 +1,109 @@
+"""Tests for the semantic verification cache."""
+
+import numpy as np
+
+from app.services.semantic_cache import SemanticCache, _MAX_GROUP_ENTRIES
+
+PROJECT = "project-1"
+MODEL = "gemini-test"
+DIM = _MAX_GROUP_ENTRIES + 8
+
+
+def _basis(i: int) -> np.ndarray:
+    """Unit vector along axis i; distinct axes have cosine 0."""
+    vec = np.zeros(DIM, dtype=np.float32)
+    vec[i] = 1.0
+    return vec
+
+
+def _result(label: str = "VALIDATED") -> dict:
+    return {
+        "validation_result": label,
+        "confidence_score": 0.9,
+        "reasoning": "supported",
+        "citations": [{"chunk_id": "c1", "cited_text": "quote"}],
+    }
+
+
+def _cache() -> SemanticCache:
+    return SemanticCache(maxsize=1024, ttl=60, threshold=0.9)
+
+
+def test_exact_hit_ignores_case_and_whitespace():
+    cache = _cache()
+    evidence = cache.evidence_key([{"chunk_id": "c1"}], "ctx")
+    cache.set(PROJECT, MODEL, "Revenue grew 10%.", evidence, _result())
+
+    assert cache.get(PROJECT, MODEL, "  revenue   GREW 10%. ", evidence) == _result()
+
+
+def test_miss_for_other_project_model_or_evidence():
+    cache = _cache()
+    evidence = cache.evidence_key([{"chunk_id": "c1"}])
+    other_evidence = cache.evidence_key([{"chunk_id": "c2"}])
+    cache.set(PROJECT, MODEL, "claim", evidence, _result())
+
+    assert cache.get("project-2", MODEL, "claim", evidence) is None
+    assert cache.get(PROJECT, "other-model", "claim", evidence) is None
+    assert cache.get(PROJECT, MODEL, "claim", other_evidence) is None
+
+
+def test_evidence_key_is_order_independent_and_includes_context():
+    chunks = [{"chunk_id": "a"}, {"chunk_id": "b"}]
+
+    assert SemanticCache.evidence_key(chunks, "ctx") == SemanticCache.evidence_key(chunks[::-1], "ctx")
+    assert SemanticCache.evidence_key(chunks, "ctx") != SemanticCache.evidence_key(chunks, "other")
+
+
+def test_results_are_copied_on_write_and_read():
+    cache = _cache()
+    evidence = cache.evidence_key([{"chunk_id": "c1"}])
+    original = _result()
+    cache.set(PROJECT, MODEL, "claim", evidence, original)
+
+    original["citations"][0]["cited_text"] = "mutated after set"
+    first = cache.get(PROJECT, MODEL, "claim", evidence)
+    first["reasoning"] = "mutated by caller"
+    first["citations"][0]["cited_text"] = "mutated by caller"
+    first["citations"].append({"chunk_id": "extra"})
+
+    assert cache.get(PROJECT, MODEL, "claim", evidence) == _result()
+
+
+def test_paraphrase_hit_above_threshold():
+    cache = _cache()
+    evidence = cache.evidence_key([{"chunk_id": "c1"}])
+    cache.set(PROJECT, MODEL, "Revenue grew ten percent", evidence, _result(), _basis(0))
+
+    # cosine(e0, 0.99*e0 + 0.1*e1) ~ 0.995
+    near = 0.99 * _basis(0) + 0.1 * _basis(1)
+
+    assert cache.get(PROJECT, MODEL, "Sales rose by 10%", evidence, near) == _result()
+
+
+def test_paraphrase_miss_below_threshold_or_with_other_evidence():
+    cache = _cache()
+    evidence = cache.evidence_key([{"chunk_id": "c1"}])
+    other_evidence = cache.evidence_key([{"chunk_id": "c2"}])
+    cache.set(PROJECT, MODEL, "Revenue grew ten percent", evidence, _result(), _basis(0))
+
+    # cosine(e0, e0 + e1) ~ 0.707
+    far = _basis(0) + _basis(1)
+
+    assert cache.get(PROJECT, MODEL, "Sales rose by 10%", evidence, far) is None
+    assert cache.get(PROJECT, MODEL, "Sales rose by 10%", other_evidence, _basis(0)) is None
+
+
+def test_paraphrase_group_keeps_only_most_recent_entries():
+    cache = _cache()
+    evidence = cache.evidence_key([{"chunk_id": "c1"}])
+    for i in range(_MAX_GROUP_ENTRIES + 1):
+        cache.set(PROJECT, MODEL, f"claim {i}", evidence, _result(f"R{i}"), _basis(i))
+
+    # The oldest vector fell out of the group; its exact entry is still cached
+    assert cache.get(PROJECT, MODEL, "paraphrase of claim 0", evidence, _basis(0)) is None
+    assert cache.get(PROJECT, MODEL, "claim 0", evidence)["validation_result"] == "R0"
+
+    newest = _MAX_GROUP_ENTRIES
+    hit = cache.get(PROJECT, MODEL, "paraphrase of newest", evidence, _basis(newest))
+    assert hit["validation_result"] == f"R{newest}"
@@ -0,0 +1,58 @@
+"""Tests for signed direct-upload tokens."""
+
+import time
+
+from app.core.config import settings
+from app.helpers.upload_token import create_upload_token, verify_upload_token
+
+CLAIMS = {
+    "project_id": "0b6f3c1e-6d8a-4f1e-9a51-2f8e1c9d7a10",
+    "filename": "5d1c9f0a-3b7e-4c2d-8e6f-1a2b3c4d5e6f_report.pdf",
+    "original_filename": "report.pdf",
+    "document_type": "main",
+}
+
+
+def test_round_trip_returns_claims_with_expiry():
+    token = create_upload_token(CLAIMS, expires_in=60)
+
+    claims = verify_upload_token(token)
+
+    assert claims is not None
+    assert {k: claims[k] for k in CLAIMS} == CLAIMS
+    assert claims["exp"] > time.time()
+
+
+def test_tampered_payload_is_rejected():
+    token = create_upload_token(CLAIMS, expires_in=60)
+    forged = create_upload_token({**CLAIMS, "filename": "other.pdf"}, expires_in=60)
+
+    # Forged payload with the original signature
+    spliced = f"{forged.split('.')[0]}.{token.split('.')[1]}"
+
+    assert verify_upload_token(spliced) is None
+
+
+def test_tampered_signature_is_rejected():
+    payload, signature = create_upload_token(CLAIMS, expires_in=60).split(".")
+    flipped = ("A" if signature[0] != "A" else "B") + signature[1:]
+
+    assert verify_upload_token(f"{payload}.{flipped}") is None
+
+
+def test_expired_token_is_rejected():
+    token = create_upload_token(CLAIMS, expires_in=-1)
+
+    assert verify_upload_token(token) is None
+
+
+def test_token_signed_with_another_key_is_rejected(monkeypatch):
+    token = create_upload_token(CLAIMS, expires_in=60)
+    monkeypatch.setattr(settings, "SECRET_KEY", settings.SECRET_KEY + "-rotated")
+
+    assert verify_upload_token(token) is None
+
+
+def test_malformed_tokens_are_rejected():
+    for token in ("", "no-separator", "!!!.???", "e30.", ".abc"):
+        assert verify_upload_token(token) is None